@@ -4,6 +4,7 @@ import sys
 import os
 import struct
 import array
+import atexit
     
 def _paddedFormat(fmt):
     l = struct.calcsize(fmt)
@@ -90,14 +91,22 @@ class GeneralWriter:
 
 
 
+    # rows are buffered and written once the buffer reaches this many bytes
+    rowBufferSize       = 1 << 16
+
+
     def errorMessage(self, message):
+        self.flush()
         os.write(sys.stdout.fileno(), _make1StringEvent(self.evt_errmsg, message.encode('utf-8')))
 
     def logMessage(self, message):
+        self.flush()
         os.write(sys.stdout.fileno(), _make1StringEvent(self.evt_logmsg, message.encode('utf-8')))
 
     def write(self, spec):
+        """ events for the whole row are collected and added to the row buffer """
         tableId = spec['_tableId']
+        row = []
         for k in spec:
             if k.startswith('_'):
                 continue
@@ -109,11 +118,32 @@ class GeneralWriter:
                 except:
                     pass
                 try:
-                    self._writeColumnData(c['_columnId'], len(data), data)
+                    self._makeColumnData(row, c['_columnId'], len(data), data)
                 except:
                     sys.stderr.write("failed to write column #{}\n".format(c['_columnId']))
                     raise
-        self._writeNextRow(tableId)
+        row.append(_makeSimpleEvent(self.evt_next_row + tableId))
+        self._rows += b''.join(row)
+        if len(self._rows) >= self.rowBufferSize:
+            self.flush()
+
+
+    def flush(self):
+        """ writes out any buffered rows (os.write may write only part of them) """
+        rows = memoryview(self._rows)
+        while rows:
+            rows = rows[os.write(sys.stdout.fileno(), rows):]
+        del rows
+        self._rows.clear()
+
+
+    def close(self):
+        """ writes out any buffered rows and ends the stream """
+        if not self._closed:
+            self._closed = True
+            atexit.unregister(self.flush)
+            self.flush()
+            GeneralWriter._writeEndStream()
 
 
     @classmethod
@@ -172,28 +202,29 @@ class GeneralWriter:
     
     
     @classmethod
-    def _writeColumnData(cls, colId, count, data):
-        l = os.write(sys.stdout.fileno(), _makeDataEvent(cls.evt_cell_data + colId, count))
-        l = (l + os.write(sys.stdout.fileno(), data)) % 4
+    def _makeColumnData(cls, row, colId, count, data):
+        """ appends the cell data event, data and padding to row """
+        data = memoryview(data)
+        row.append(_makeDataEvent(cls.evt_cell_data + colId, count))
+        row.append(data)
+        l = data.nbytes % 4
         if l != 0:
-            os.write(sys.stdout.fileno(), struct.pack("%dx" % (4 - l)))
-
-
-    @classmethod
-    def _writeNextRow(cls, tableId):
-        os.write(sys.stdout.fileno(), _makeSimpleEvent(cls.evt_next_row + tableId))
+            row.append(bytes(4 - l))
 
 
     def writeDbMetadata(self, nodeName, nodeValue):
         """ this only supports writing to the default database """
+        self.flush()
         GeneralWriter._writeDbMetadata(0, nodeName.encode('ascii'), nodeValue.encode('utf-8'))
 
 
     def writeTableMetadata(self, table, nodeName, nodeValue):
+        self.flush()
         GeneralWriter._writeTableMetadata(table['_tableId'], nodeName.encode('ascii'), nodeValue.encode('utf-8'))
 
 
     def writeColumnMetadata(self, column, nodeName, nodeValue):
+        self.flush()
         GeneralWriter._writeColumnMetadata(column['_columnId'], nodeName.encode('ascii'), nodeValue.encode('utf-8'))
 
 
@@ -214,6 +245,13 @@ class GeneralWriter:
             versionString is a three-part number like "2.1.5"
         """
         
+        # Buffered rows are written out at exit even if the loader
+        # dies (e.g. uncaught exception) before calling close()
+
+        self._rows = bytearray()
+        self._closed = False
+        atexit.register(self.flush)
+
         GeneralWriter._writeHeader(fileName.encode('utf-8')
             , schemaFileName.encode('utf-8')
             , schemaDbSpec.encode('ascii'))
@@ -249,7 +287,10 @@ class GeneralWriter:
 
 
     def __del__(self):
-        try: GeneralWriter._writeEndStream()
+        """ fallback for loaders that do not call close() """
+        try:
+            if not getattr(self, '_closed', True):
+                self.close()
         except: pass
 
 
@@ -0,0 +1,64 @@
+# Tests for GeneralWriter row buffering
+#
+# Each case runs a small loader in a subprocess so that its stdout
+# (the general-loader stream) can be checked after the process exits.
+
+import os
+import struct
+import subprocess
+import sys
+import unittest
+
+import GeneralWriter
+
+LOADER = """
+import os, sys
+import GeneralWriter
+
+# Loaders hand stdout over to a binary file object (as fastq-load does)
+
+sys.stdout = os.fdopen(sys.stdout.fileno(), 'wb')
+
+tbl = { 'SEQUENCE' : { 'READ' : { 'expression' : '(INSDC:dna:text)READ',
+                                  'elem_bits' : 8 } } }
+gw = GeneralWriter.GeneralWriter('out', 'schema', 'db', 'test', '1.0.0', tbl)
+for row in range(3):
+    tbl['SEQUENCE']['READ']['data'] = 'ROW{}MARK'.format(row).encode('ascii')
+    gw.write(tbl['SEQUENCE'])
+"""
+
+END_STREAM = struct.pack("I", GeneralWriter.GeneralWriter.evt_end_stream)
+
+class GeneralWriterTest (unittest.TestCase):
+
+    def runLoader(self, ending):
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.path.dirname(os.path.abspath(__file__))
+        return subprocess.run([sys.executable, '-c', LOADER + ending],
+                              capture_output=True, env=env, timeout=60)
+
+    def assertRowsWritten(self, stdout):
+        for row in range(3):
+            self.assertIn('ROW{}MARK'.format(row).encode('ascii'), stdout)
+
+    def testClose(self):
+        p = self.runLoader("gw.close()\ngw = None\n")
+        self.assertEqual(p.returncode, 0)
+        self.assertRowsWritten(p.stdout)
+        self.assertTrue(p.stdout.endswith(END_STREAM))
+        self.assertEqual(p.stderr, b'')
+
+    def testRowsWrittenOnUncaughtException(self):
+        p = self.runLoader("raise RuntimeError('failure mid-load')\n")
+        self.assertNotEqual(p.returncode, 0)
+        self.assertRowsWritten(p.stdout)
+        self.assertIn(b'failure mid-load', p.stderr)
+        self.assertNotIn(b'Exception ignored', p.stderr)
+
+    def testRowsWrittenOnExit(self):
+        p = self.runLoader("sys.exit(3)\n")
+        self.assertEqual(p.returncode, 3)
+        self.assertRowsWritten(p.stdout)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -169,5 +169,6 @@ def cleanup():
     pass
 
 main()
+gw.close() # flush buffered rows and end stream
 gw = None
 cleanup()
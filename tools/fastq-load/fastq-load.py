@@ -1,5 +1,4 @@
-#!/opt/python-2.7env/bin/python
-####/opt/python-3.4/bin/python
+#!/usr/bin/env python3
 #===========================================================================
 #
 #                            PUBLIC DOMAIN NOTICE
@@ -134,13 +133,31 @@ import GeneralWriter
 import logging
 import os
 import re
-import copy
-import gzip
 import bz2
+import io
+import queue
+import threading
 import datetime
-import string
 import time
 
+# ISA-L's igzip is a drop-in for gzip with a much faster inflate;
+# use it when installed
+
+try:
+    from isal import igzip as gzip
+except ImportError:
+    import gzip
+
+############################################################
+# Interpreter check (CPython 3.11+ or PyPy3)
+############################################################
+
+if ( sys.version_info < (3,11) and
+     not ( sys.implementation.name == 'pypy' and
+           sys.version_info >= (3,9) ) ):
+    sys.stderr.write( "\nfastq-load.py requires python 3.11 or later (or pypy3) ... found {}\n\n".format(sys.version.split()[0]) )
+    exit(1)
+
 ############################################################
 # Environment globals
 ############################################################
@@ -202,6 +219,16 @@ Usage: fastq-load.py\n
 
 class StatusWriter:
     """ Outputs status to stderr and optionally to an xml log file """
+
+    XML_ESCAPE = str.maketrans( { '&' : '&amp;',
+                                  '"' : '&quot;',
+                                  "'" : '&apos;',
+                                  '<' : '&lt;',
+                                  '>' : '&gt;' } )
+
+    lastTimeSecond = None
+    lastTimeString = ''
+
     def __init__(self, vers):
         self.vers = vers
         self.xmlLogHandle = None
@@ -214,7 +241,7 @@ class StatusWriter:
     def setXmlLog ( self, xmlLogFile ):
         xmlLogFile = xmlLogFile.strip()
         try:
-            self.xmlLogHandle = open(xmlLogFile, 'w')
+            self.xmlLogHandle = open(xmlLogFile, 'w', buffering=65536)
             self.xmlLogHandle.write("<Log>\n")
         except OSError:
             sys.exit( "\nFailed to open {} for writing\n\n".format(xmlLogFile) )
@@ -239,16 +266,17 @@ class StatusWriter:
         sys.stderr.flush()
 
     ############################################################
-    # Output status message
+    # Output warning message. Warnings can come once per spot for
+    # bad input, so the xml log is left to be flushed by the next
+    # info message (or on exit) rather than after every warning.
+    # stderr is line buffered already.
     ############################################################
     def outputWarning ( self, message ):
         dateTime = self.getTime()
         if self.xmlLogHandle:
             self.xmlLogHandle.write('<warning app="fastq-load.py" message="{}" pid="{}" timestamp="{}" version="{}"/>\n'
                                     .format(self.escape(message),self.pid,dateTime,self.vers))
-            self.xmlLogHandle.flush()
         sys.stderr.write("{} fastq-load.py.{} warn: {}\n".format(dateTime,self.vers,message) )
-        sys.stderr.flush()
 
     ############################################################
     # Output status message and exit
@@ -265,23 +293,20 @@ class StatusWriter:
     ############################################################
     # Escape message (wrote my own instead of importing sax escape)
     ############################################################
-    @staticmethod
-    def escape(message):
-        message = message.replace('&', '&amp;')
-        message = message.replace('"', '&quot;')
-        message = message.replace("'", '&apos;')
-        message = message.replace('<', '&lt;')
-        message = message.replace('>', '&gt;')
-        return message
+    @classmethod
+    def escape(cls, message):
+        return message.translate(cls.XML_ESCAPE)
 
     ############################################################
-    # Get formatted date time
+    # Get formatted date time (only reformatted once per second)
     ############################################################
-    @staticmethod
-    def getTime():
-        now = datetime.datetime.utcnow()
-        now = now.replace(microsecond=0)
-        return now.isoformat()
+    @classmethod
+    def getTime(cls):
+        now = int( time.time() )
+        if now != cls.lastTimeSecond:
+            cls.lastTimeSecond = now
+            cls.lastTimeString = datetime.datetime.utcfromtimestamp(now).isoformat()
+        return cls.lastTimeString
 
 ############################################################
 # Define Platform and convert platform to SRA enum
@@ -302,34 +327,27 @@ class Platform(Enum):
 
     @classmethod
     def convertPlatformString ( cls, platformString ):
-        platformString = platformString.upper()
-        if ( platformString == "454" or
-             platformString == "LS454" ):
-            return cls.SRA_PLATFORM_454
-        elif platformString == "ILLUMINA":
-            return cls.SRA_PLATFORM_ILLUMINA
-        elif ( platformString == "ABI" or
-               platformString == "SOLID" or
-               platformString == "ABSOLID" or
-               platformString == "ABISOLID" ):
-            return cls.SRA_PLATFORM_ABSOLID
-        elif ( platformString == "PACBIO" or
-               platformString == "PACBIO_SMRT"):
-            return cls.SRA_PLATFORM_PACBIO_SMRT
-        elif ( platformString == "CAPILLARY" or
-               platformString == "SANGER" ):
-            return cls.SRA_PLATFORM_CAPILLARY
-        elif platformString == "NANOPORE":
-            return cls.SRA_PLATFORM_OXFORD_NANOPORE
-        elif platformString == "HELICOS":
-            return cls.SRA_PLATFORM_HELICOS
-        elif platformString == "ION_TORRENT":
-            return cls.SRA_PLATFORM_ION_TORRENT
-        elif ( platformString == "UNDEFINED" or
-               platformString == "MIXED" ):
-            return cls.SRA_PLATFORM_UNDEFINED
-        else:
-            return None
+        return platformStrings.get( platformString.upper() )
+
+# Map from platform string (upper case) to SRA platform. Kept outside
+# the class since a dict attribute of an Enum would become a member.
+
+platformStrings = { "454"         : Platform.SRA_PLATFORM_454,
+                    "LS454"       : Platform.SRA_PLATFORM_454,
+                    "ILLUMINA"    : Platform.SRA_PLATFORM_ILLUMINA,
+                    "ABI"         : Platform.SRA_PLATFORM_ABSOLID,
+                    "SOLID"       : Platform.SRA_PLATFORM_ABSOLID,
+                    "ABSOLID"     : Platform.SRA_PLATFORM_ABSOLID,
+                    "ABISOLID"    : Platform.SRA_PLATFORM_ABSOLID,
+                    "PACBIO"      : Platform.SRA_PLATFORM_PACBIO_SMRT,
+                    "PACBIO_SMRT" : Platform.SRA_PLATFORM_PACBIO_SMRT,
+                    "CAPILLARY"   : Platform.SRA_PLATFORM_CAPILLARY,
+                    "SANGER"      : Platform.SRA_PLATFORM_CAPILLARY,
+                    "NANOPORE"    : Platform.SRA_PLATFORM_OXFORD_NANOPORE,
+                    "HELICOS"     : Platform.SRA_PLATFORM_HELICOS,
+                    "ION_TORRENT" : Platform.SRA_PLATFORM_ION_TORRENT,
+                    "UNDEFINED"   : Platform.SRA_PLATFORM_UNDEFINED,
+                    "MIXED"       : Platform.SRA_PLATFORM_UNDEFINED }
 
 ############################################################
 # Defline class (not an enum)
@@ -338,6 +356,18 @@ class Platform(Enum):
 class Defline:
     """ Retains information parsed from fastq defline """
 
+    __slots__ = ( 'deflineType', 'deflineStringOrig', 'deflineString',
+                  'saveDeflineType', 'name', 'platform', 'isValid', 'readNum',
+                  'filterRead', 'spotGroup', 'prefix', 'lane', 'tile', 'x',
+                  'y', 'numDiscards', 'foundRE', 'dateAndHash454', 'region454',
+                  'xy454', 'qiimeName', 'filename', 'poreRead', 'poreFile',
+                  'channel', 'readNo', 'flowcell', 'field', 'camera',
+                  'position', 'runId', 'row', 'column', 'dir', 'panel',
+                  'tagType', 'suffix', 'abiTitle', 'statusWriter',
+                  'ignLeadCharsNum', 'ignoredLeadChars', 'illuminaNew',
+                  'illuminaOld', 'illuminaOldBcRn', 'qiimeIlluminaNew',
+                  'nanopore' )
+
     ILLUMINA_NEW                = 1
     ILLUMINA_OLD                = 2
     PACBIO                      = 3
@@ -363,6 +393,77 @@ class Defline:
     ION_TORRENT                 = 23
     SANGER_NEWBLER              = 24
     
+    ############################################################
+    # Defline regular expressions. Compiled once and shared by
+    # all instances. While the defline type is still unknown,
+    # patterns that need a keyword (e.g. 'template=', 'read_id=')
+    # or separator (e.g. ':N:', inner whitespace) are only tried
+    # if it is present. Deflines are
+    # ASCII, so the patterns are compiled with re.ASCII.
+    ############################################################
+
+    illuminaNewTag = re.compile("[:_][NY][:_]", re.ASCII) # filter flag field is required by illuminaNew*
+    illuminaNewDefault = re.compile(r"[@>]([!-~]+?)(:|_)(\d+)(:|_)(\d+)(:|_)(\d+)(:|_)(\d+)(\s+|[_\|])([12345]|):([NY]):(\d+|O):?([!-~]*?)(\s+|$)", re.ASCII)
+    illuminaNewNoPrefix = re.compile(r"[@>]([!-~]*?)(:?)(\d+)(:|_)(\d+)(:|_)(\d+)(:|_)(\d+)(\s+|_)([12345]|):([NY]):(\d+|O):?([!-~]*?)(\s+|$)", re.ASCII)
+    illuminaNewWithJunk = re.compile(r"[@>]([!-~]+?)(:|_)(\d+)(:|_)(\d+)(:|_)(\d+)(:|_)(\d+)([!-~]+?\s*)([12345]|):([NY]):(\d+|O):?([!-~]*?)(\s+|$)", re.ASCII)
+    illuminaNewWithPeriods = re.compile(r"[@>]([!-~]+?)(\.)(\d+)(\.)(\d+)(\.)(\d+)(\.)(\d+)(\s+|_)([12345]|)\.([NY])\.(\d+|O)\.?([!-~]*?)(\s+|$)", re.ASCII)
+    illuminaNewWithUnderscores = re.compile(r"[@>]([!-~]+?)(_)(\d+)(_)(\d+)(_)(\d+)(_)(\d+)(\s+|_)([12345]|)_([NY])_(\d+|O)_?([!-~]*?)(\s+|$)", re.ASCII)
+    illuminaNewSuffix = re.compile(r"(#[!-~]*?|)(/[12345]|\\[12345])?([!-~]*?)(#[!-~]*?|)(/[12345]|\\[12345])?([:_\|]?)(\s+|$)", re.ASCII)
+
+    illuminaOldColon = re.compile(r"[@>]?([!-~]+?)(:)(\d+)(:)(\d+)(:)(-?\d+)(:)(-?\d+)_?[012]?(#[!-~]*?|)\s?(/[12345]|\\[12345])?(\s+|$)", re.ASCII)
+    illuminaOldUnderscore = re.compile(r"[@>]?([!-~]+?)(_)(\d+)(_)(\d+)(_)(-?\d+)(_)(-?\d+)(#[!-~]*?|)\s?(/[12345]|\\[12345])?(\s+|$)", re.ASCII)
+    illuminaOldNoPrefix = re.compile(r"[@>]?([!-~]*?)(:?)(\d+)(:)(\d+)(:)(-?\d+)(:)(-?\d+)(#[!-~]*?|)\s?(/[12345]|\\[12345])?(\s+|$)", re.ASCII)
+    illuminaOldWithJunk = re.compile(r"[@>]?([!-~]+?)(:)(\d+)(:)(\d+)(:)(-?\d+)(:)(-?\d+)(#[!-~]+)(/[12345])[!-~]+(\s+|$)", re.ASCII)
+    illuminaOldWithJunk2 = re.compile(r"[@>]?([!-~]+?)(:)(\d+)(:)(\d+)(:)(-?\d+)(:)(-?\d+[!-~]+?)(#[!-~]*|)\s?(/[12345]|\\[12345])?(\s+|$)", re.ASCII)
+    illuminaOldDiscard1 = { sep : re.compile(r"([!-~]*?)(" + sep + r")(\d+)$", re.ASCII) for sep in ( ':', '_' ) } # keyed by sep4
+    illuminaOldDiscard2 = { sep : re.compile(r"([!-~]*?)(" + sep + r")(\d+)(" + sep + r")(\d+)(\s+|$)", re.ASCII) for sep in ( ':', '_' ) }
+    illuminaOldDiscard2NoPrefix = { sep : re.compile(r"(\d+)(" + sep + r")(\d+)(\s+|$)", re.ASCII) for sep in ( ':', '_' ) }
+    illuminaOldSuffix = re.compile(r"(-?\d+)([!-~]*)", re.ASCII) # Must have '*' and not '+'. Otherwise, name for pairing is truncated by one character.
+
+    illuminaOldBcRnOnly = re.compile(r"[@>]([!-~]+?)(#[!-~]+?)(/[12345]|\\[12345])(\s+|$)", re.ASCII)
+    illuminaOldBcOnly = re.compile(r"[@>]([!-~]+?)(#[!-~]+)(\s+|$)(.?)", re.ASCII)
+    illuminaOldRnOnly = re.compile(r"[@>]([!-~]+?)(/[12345]|\\[12345])(\s+|$)(.?)", re.ASCII)
+
+    qiimeTag = re.compile(r"\s", re.ASCII) # QIIME label is followed by whitespace
+    qiimeBc = re.compile(r"[@>]([!-~]*).*?\s+orig_bc=[!-~]+\s+new_bc=([!-~]+)\s+bc_diffs=[01]", re.ASCII)
+    qiimeIlluminaNewDefault = re.compile(r"[@>]([!-~]*)\s+([!-~]*?)(:|_)(\d+)(:|_)(\d+)(:|_)(\d+)(:|_)(\d+)(\s+|_|:)([12345]):([NY]):(\d+|O):?([!-~]*?)(\s+|$)", re.ASCII)
+    qiimeIlluminaNewPeriods = re.compile(r"[@>]([!-~]*)\s+([!-~]*?)(\.)(\d+)(\.)(\d+)(\.)(\d+)(\.)(\d+)(\s+|_|:)([12345])\.([NY])\.(\d+|O)\.?([!-~]*?)(\s+|$)", re.ASCII)
+    qiimeIlluminaNewUnderscores = re.compile(r"[@>]([!-~]*)\s+([!-~]*?)(_)(\d+)(_)(\d+)(_)(\d+)(_)(\d+)(\s+|_|:)([12345])_([NY])_(\d+|O)_?([!-~]*?)(\s+|$)", re.ASCII)
+
+    qiimeIlluminaOld = re.compile(r"[@>]([!-~]*)\s+([!-~]+?)(:)(\d+)(:)(\d+)(:)(-?\d+)(:)(-?\d+)(#[!-~]*?|)\s?(/[12345]|\\[12345])?(\s+|$)", re.ASCII)
+
+    ls454 = re.compile(r"[@>]([!-~]+_|)([A-Z0-9]{7})(\d{2})([A-Z0-9]{5})(/[12345])?(\s+|$)", re.ASCII)
+    qiime454 = re.compile(r"[@>]([!-~]*)\s+([A-Z0-9]{7})(\d{2})([A-Z0-9]{5})(/[12345])?(\s+|$)", re.ASCII)
+
+    pacbio = re.compile(r"[@>](m\d{6}_\d{6}_[!-~]+?_c\d{33}_s\d+_[pX]\d/\d+/?\d*_?\d*)(\s+|$)", re.ASCII)
+
+    nanoporeDefault = re.compile(r"[@>]+?(channel_)(\d+)(_read_)(\d+)([!-~]*?)(_twodirections|_2d|-2D|_template|-1D|_complement|-complement|\.1C|\.1T|\.2D)?(:[!-~]+?_ch\d+_file\d+_strand.fast5)?(\s+|$)", re.ASCII)
+    nanopore2 = re.compile(r"[@>]([!-~]*?ch)(\d+)(_file)(\d+)([!-~]*?)(_twodirections|_2d|-2D|_template|-1D|_complement|-complement|\.1C|\.1T|\.2D)(:[!-~]+?_ch\d+_file\d+_strand.fast5)?(\s+|$)", re.ASCII)
+    nanopore3 = re.compile(r"[@>]([!-~]+?_Basecall_2D[_0]*?)(_twodirections|_2d|-2D|_template|-1D|_complement|-complement|\.1C|\.1T|\.2D)[: ]([!-~]+?)[: ]([!-~]+?_ch)(\d+)(_read|_file)(\d+)(_strand\d*.fast5)(\s+|$)", re.ASCII)
+    nanoporeBarcode = re.compile(r"(NB\d{2}|BC\d{2})(/|\\)", re.ASCII) # searched in nanopore poreFile
+    # Normalized nanopore read type (anything else captured is complement)
+    nanoporeReadTypes = { "_twodirections" : "2D",
+                          "_2d"            : "2D",
+                          "-2D"            : "2D",
+                          ".2D"            : "2D",
+                          "_template"      : "template",
+                          "-1D"            : "template",
+                          ".1T"            : "template" }
+
+    helicos = re.compile(r"[@>](VHE-\d+)-(\d+)-(\d+)-(\d)-(\d+)(\s+|$)", re.ASCII)
+
+    ionTorrent = re.compile(r"[@>]([A-Z0-9]{5})(:)(\d{1,5})(:)(\d{1,5})(/[12345]|\\[12345]|[LR])?(\s+|$)", re.ASCII)
+
+    abSolidTag = re.compile("F3|R3|BC|F5-", re.ASCII) # one of the tags is required by abSolid
+    abSolid = re.compile(r"[@>]([!-~]*?)(\d+)_(\d+)_(\d+)_(F3|R3|F5-BC|BC|F5-P2|F5-RNA|F5-DNA)([!-~]*?)(\s+|$)", re.ASCII)
+
+    sangerNewbler = re.compile(r"[@>]([!-~]+?)\s+template=([!-~]+)\s+dir=([!-~]+)(\s+|$)", re.ASCII)
+    sangerReadNums = { 'f' : '1', 'F' : '1', 'r' : '2', 'R' : '2' } # from first char of dir=
+
+    readIdBarcode = re.compile(r"[@>]([!-~]+)\s+read_id=([!-~]*?::|)([!-~]+)\s+barcode=([!-~]+).*(\s+|$)", re.ASCII)
+
+    undefined = re.compile(r"[@>]([!-~]+)(\s+|$)", re.ASCII)
+
     def __init__(self, deflineString):
         self.deflineType = None
         self.deflineStringOrig = ''
@@ -406,53 +507,13 @@ class Defline:
         self.ignLeadCharsNum = None
         self.ignoredLeadChars = None
 
-        self.illuminaNew = re.compile("[@>]([!-~]+?)(:|_)(\d+)(:|_)(\d+)(:|_)(\d+)(:|_)(\d+)(\s+|[_\|])([12345]|):([NY]):(\d+|O):?([!-~]*?)(\s+|$)")
-        self.illuminaNewNoPrefix = re.compile("[@>]([!-~]*?)(:?)(\d+)(:|_)(\d+)(:|_)(\d+)(:|_)(\d+)(\s+|_)([12345]|):([NY]):(\d+|O):?([!-~]*?)(\s+|$)")
-        self.illuminaNewWithJunk = re.compile("[@>]([!-~]+?)(:|_)(\d+)(:|_)(\d+)(:|_)(\d+)(:|_)(\d+)([!-~]+?\s*)([12345]|):([NY]):(\d+|O):?([!-~]*?)(\s+|$)")
-        self.illuminaNewWithPeriods = re.compile("[@>]([!-~]+?)(\.)(\d+)(\.)(\d+)(\.)(\d+)(\.)(\d+)(\s+|_)([12345]|)\.([NY])\.(\d+|O)\.?([!-~]*?)(\s+|$)")
-        self.illuminaNewWithUnderscores = re.compile("[@>]([!-~]+?)(_)(\d+)(_)(\d+)(_)(\d+)(_)(\d+)(\s+|_)([12345]|)_([NY])_(\d+|O)_?([!-~]*?)(\s+|$)")
-        self.illuminaNewSuffix = re.compile("(#[!-~]*?|)(/[12345]|\\\\[12345])?([!-~]*?)(#[!-~]*?|)(/[12345]|\\\\[12345])?([:_\|]?)(\s+|$)")
+        # Regex variants settled on per instance (see parseDeflineString)
 
+        self.illuminaNew = self.illuminaNewDefault
         self.illuminaOld = None
-        self.illuminaOldColon = re.compile("[@>]?([!-~]+?)(:)(\d+)(:)(\d+)(:)(-?\d+)(:)(-?\d+)_?[012]?(#[!-~]*?|)\s?(/[12345]|\\\\[12345])?(\s+|$)")
-        self.illuminaOldUnderscore = re.compile("[@>]?([!-~]+?)(_)(\d+)(_)(\d+)(_)(-?\d+)(_)(-?\d+)(#[!-~]*?|)\s?(/[12345]|\\\\[12345])?(\s+|$)")
-        self.illuminaOldNoPrefix = re.compile("[@>]?([!-~]*?)(:?)(\d+)(:)(\d+)(:)(-?\d+)(:)(-?\d+)(#[!-~]*?|)\s?(/[12345]|\\\\[12345])?(\s+|$)")
-        self.illuminaOldWithJunk = re.compile("[@>]?([!-~]+?)(:)(\d+)(:)(\d+)(:)(-?\d+)(:)(-?\d+)(#[!-~]+)(/[12345])[!-~]+(\s+|$)")
-        self.illuminaOldWithJunk2 = re.compile("[@>]?([!-~]+?)(:)(\d+)(:)(\d+)(:)(-?\d+)(:)(-?\d+[!-~]+?)(#[!-~]*|)\s?(/[12345]|\\\\[12345])?(\s+|$)")
-        self.illuminaOldSuffix = re.compile("(-?\d+)([!-~]*)") # Must have '*' and not '+'. Otherwise, name for pairing is truncated by one character.
-
         self.illuminaOldBcRn = None
-        self.illuminaOldBcRnOnly = re.compile("[@>]([!-~]+?)(#[!-~]+?)(/[12345]|\\\\[12345])(\s+|$)")
-        self.illuminaOldBcOnly = re.compile("[@>]([!-~]+?)(#[!-~]+)(\s+|$)(.?)")
-        self.illuminaOldRnOnly = re.compile("[@>]([!-~]+?)(/[12345]|\\\\[12345])(\s+|$)(.?)")
-
-        self.qiimeBc = re.compile("[@>]([!-~]*).*?\s+orig_bc=[!-~]+\s+new_bc=([!-~]+)\s+bc_diffs=[01]")
-        self.qiimeIlluminaNew = re.compile("[@>]([!-~]*)\s+([!-~]*?)(:|_)(\d+)(:|_)(\d+)(:|_)(\d+)(:|_)(\d+)(\s+|_|:)([12345]):([NY]):(\d+|O):?([!-~]*?)(\s+|$)")
-        self.qiimeIlluminaNewPeriods = re.compile("[@>]([!-~]*)\s+([!-~]*?)(\.)(\d+)(\.)(\d+)(\.)(\d+)(\.)(\d+)(\s+|_|:)([12345])\.([NY])\.(\d+|O)\.?([!-~]*?)(\s+|$)")
-        self.qiimeIlluminaNewUnderscores = re.compile("[@>]([!-~]*)\s+([!-~]*?)(_)(\d+)(_)(\d+)(_)(\d+)(_)(\d+)(\s+|_|:)([12345])_([NY])_(\d+|O)_?([!-~]*?)(\s+|$)")
-        
-        self.qiimeIlluminaOld = re.compile("[@>]([!-~]*)\s+([!-~]+?)(:)(\d+)(:)(\d+)(:)(-?\d+)(:)(-?\d+)(#[!-~]*?|)\s?(/[12345]|\\\\[12345])?(\s+|$)")
-
-        self.ls454 = re.compile("[@>]([!-~]+_|)([A-Z0-9]{7})(\d{2})([A-Z0-9]{5})(/[12345])?(\s+|$)")
-        self.qiime454 = re.compile("[@>]([!-~]*)\s+([A-Z0-9]{7})(\d{2})([A-Z0-9]{5})(/[12345])?(\s+|$)")
-
-        self.pacbio = re.compile("[@>](m\d{6}_\d{6}_[!-~]+?_c\d{33}_s\d+_[pX]\d/\d+/?\d*_?\d*)(\s+|$)")
-
-        self.nanopore = re.compile("[@>]+?(channel_)(\d+)(_read_)(\d+)([!-~]*?)(_twodirections|_2d|-2D|_template|-1D|_complement|-complement|\.1C|\.1T|\.2D)?(:[!-~]+?_ch\d+_file\d+_strand.fast5)?(\s+|$)")
-        self.nanopore2 = re.compile("[@>]([!-~]*?ch)(\d+)(_file)(\d+)([!-~]*?)(_twodirections|_2d|-2D|_template|-1D|_complement|-complement|\.1C|\.1T|\.2D)(:[!-~]+?_ch\d+_file\d+_strand.fast5)?(\s+|$)")
-        self.nanopore3 = re.compile("[@>]([!-~]+?_Basecall_2D[_0]*?)(_twodirections|_2d|-2D|_template|-1D|_complement|-complement|\.1C|\.1T|\.2D)[: ]([!-~]+?)[: ]([!-~]+?_ch)(\d+)(_read|_file)(\d+)(_strand\d*.fast5)(\s+|$)")
-
-        self.helicos = re.compile("[@>](VHE-\d+)-(\d+)-(\d+)-(\d)-(\d+)(\s+|$)")
-
-        self.ionTorrent = re.compile("[@>]([A-Z0-9]{5})(:)(\d{1,5})(:)(\d{1,5})(/[12345]|\\\\[12345]|[LR])?(\s+|$)")
-
-        self.abSolid = re.compile("[@>]([!-~]*?)(\d+)_(\d+)_(\d+)_(F3|R3|F5-BC|BC|F5-P2|F5-RNA|F5-DNA)([!-~]*?)(\s+|$)")
-
-        self.sangerNewbler = re.compile("[@>]([!-~]+?)\s+template=([!-~]+)\s+dir=([!-~]+)(\s+|$)")
-
-        self.readIdBarcode = re.compile("[@>]([!-~]+)\s+read_id=([!-~]*?::|)([!-~]+)\s+barcode=([!-~]+).*(\s+|$)")
-
-        self.undefined = re.compile("[@>]([!-~]+)(\s+|$)")
+        self.qiimeIlluminaNew = self.qiimeIlluminaNewDefault
+        self.nanopore = self.nanoporeDefault
 
         if deflineString:
             self.parseDeflineString(deflineString)
@@ -555,6 +616,16 @@ class Defline:
         else:
             return False
 
+    ############################################################
+    # Shallow copy (patterns and statusWriter are shared)
+    ############################################################
+
+    def clone(self):
+        deflineCopy = Defline.__new__(Defline)
+        for attr in self.__slots__:
+            setattr( deflineCopy, attr, getattr( self, attr ) )
+        return deflineCopy
+
     ############################################################
     # Reset object variables
     ############################################################
@@ -607,1092 +678,1091 @@ class Defline:
         if not self.deflineStringOrig:
             pass
 
-        ############################################################
-        # helicos
-        #
-        # @VHE-242383071011-15-1-0-2 (YYY034449)
-        ############################################################
+        # Retained defline type goes straight to its parser; detection
+        # below only runs until a type has been settled on
 
-        elif ( self.deflineType == self.HELICOS or
-               ( self.deflineType is None and
-                 self.helicos.match(self.deflineString) ) ):
-            
-            m = self.helicos.match(self.deflineString)
-            
-            # Confirm regular expression succeeded
-            
-            if m is None :
+        elif self.deflineType:
+            parser = self.deflineParsers.get(self.deflineType)
+            if parser:
+                parser(self)
+            else:
                 self.isValid = False
-                return self.isValid
-
-            # Get match values
-            
-            (self.flowcell, self.channel, self.field, self.camera, self.position, endSep) = m.groups()
-
-            # Set defline name
 
-            self.name = self.flowcell + "-" + self.channel + "-" + self.field + "-" + self.camera + "-" + self.position
+        elif ( 'VHE-' in self.deflineString and
+               ( m := self.helicos.match(self.deflineString) ) ):
+            self.parseHelicos(m)
+
+        elif ( self.abSolidTag.search(self.deflineString) and
+               ( m := self.abSolid.match(self.deflineString) ) ):
+            self.parseAbSolid(m)
+
+        # Multi-variant types probe their variants in the parser's order
+        # of preference and hand over the first match
+
+        elif ( self.illuminaNewTag.search(self.deflineString) and
+               ( m := ( self.illuminaNew.match(self.deflineString) or
+                        self.illuminaNewNoPrefix.match(self.deflineString) or
+                        self.illuminaNewWithJunk.match(self.deflineString) or
+                        self.illuminaNewWithUnderscores.match(self.deflineString) ) ) ):
+            self.parseIlluminaNew(m)
+
+        # Anything illuminaOldWithJunk matches, illuminaOldWithJunk2 matches,
+        # so trying it first does not widen detection
+
+        elif ( m := ( self.illuminaOldWithJunk.match ( self.deflineString ) or
+                      self.illuminaOldColon.match ( self.deflineString ) or
+                      self.illuminaOldUnderscore.match ( self.deflineString ) or
+                      self.illuminaOldWithJunk2.match ( self.deflineString ) or
+                      self.illuminaOldNoPrefix.match ( self.deflineString ) ) ):
+            self.parseIlluminaOld(m)
+
+        elif ( self.qiimeTag.search(self.deflineString) and
+               ( m := ( self.qiimeIlluminaNew.match(self.deflineString) or
+                        self.qiimeIlluminaNewPeriods.match(self.deflineString) or
+                        self.qiimeIlluminaNewUnderscores.match(self.deflineString) ) ) ):
+            self.parseQiimeIlluminaNew(m)
+
+        elif ( self.qiimeTag.search(self.deflineString) and
+               ( m := self.qiimeIlluminaOld.match(self.deflineString) ) ):
+            self.parseQiimeIlluminaOld(m)
+
+        elif ( m := self.ls454.match( self.deflineString ) ):
+            self.parseLs454(m)
+
+        elif ( self.qiimeTag.search(self.deflineString) and
+               ( m := self.qiime454.match( self.deflineString ) ) ):
+            self.parseQiime454(m)
+
+        elif ( '/' in self.deflineString and
+               ( m := self.pacbio.match ( self.deflineString ) ) ):
+            self.parsePacbio(m)
+
+        elif ( ':' in self.deflineString and
+               ( m := self.ionTorrent.match ( self.deflineString ) ) ):
+            self.parseIonTorrent(m)
+
+        elif ( m := ( self.illuminaOldBcRnOnly.match ( self.deflineString ) or
+                      self.illuminaOldBcOnly.match ( self.deflineString ) or
+                      self.illuminaOldRnOnly.match ( self.deflineString ) ) ):
+            self.parseIlluminaOldBcRn(m)
+
+        elif ( 'orig_bc=' in self.deflineString and
+               ( m := self.qiimeBc.match( self.deflineString ) ) ):
+            self.parseQiimeGeneric(m)
+
+        elif ( ( 'channel_' in self.deflineString or
+                 '_file' in self.deflineString or
+                 '_Basecall_2D' in self.deflineString ) and
+               ( m := ( self.nanopore.match( self.deflineString ) or
+                        self.nanopore2.match( self.deflineString ) or
+                        self.nanopore3.match( self.deflineString ) ) ) ):
+            self.parseNanopore(m)
+
+        elif ( 'read_id=' in self.deflineString and
+               ( m := self.readIdBarcode.match( self.deflineString ) ) ):
+            self.parseReadIdBarcode(m)
+
+        elif ( 'template=' in self.deflineString and
+               ( m := self.sangerNewbler.match ( self.deflineString ) ) ):
+            self.parseSangerNewbler(m)
+
+        elif ( m := self.undefined.match ( self.deflineString ) ):
+            self.parseUndefined(m)
 
-            # Retain defline type if desired
+        else:
+            self.isValid = False
 
-            if ( not self.deflineType and
-                 self.saveDeflineType ):
-                self.deflineType = self.HELICOS
-                self.platform = "HELICOS"
+        if ( self.isValid and
+             self.ignLeadCharsNum ):
+            self.ignoredLeadChars = self.name[0:self.ignLeadCharsNum]
+            self.name = self.name[self.ignLeadCharsNum:]
 
-        ############################################################
-        # ab solid
-        #
-        # >3_189_730_F3 (XXX001662)
-        # >3_189_730_R3 (XXX001662)
-        # >461_28_1048_F3 (XXX001354)
-        # >349_1793_467_F3 (XXX015374)
-        # >1_98_123_BC (XXX1001434)
-        # >427_21_101_F3 (XXX112693)
-        # >427_17_22_F5-P2 (XXX112693)
-        # >2_35_407_F3 (XXX3159530)
-        # >2_35_407_F5-BC (XXX3159530)
-        # @1_43_495_F3 (XXX645822)
-        # @1_43_495_F5-BC (XXX645822)
-        # >47_15_207_F5-RNA (YYY005001)
-        # >47_15_207_F5-DNA (YYY005002)
-        # >1_01_1_23_192_F3 (YYY3222665)
-        # >1_23_192_F3_1_01 (ZZZ3222665)
-        # >427_27_224_F3 1:0003213231 (ZZZ005000)
-        ############################################################
+        return self.isValid
 
-        elif ( self.deflineType == self.ABSOLID or
-               ( self.deflineType is None and
-                 self.abSolid.match(self.deflineString) ) ):
-            
-            m = self.abSolid.match(self.deflineString)
-            
-            # Confirm regular expression succeeded
-            
-            if m is None :
-                self.isValid = False
-                return self.isValid
+    ############################################################
+    # helicos
+    #
+    # @VHE-242383071011-15-1-0-2 (YYY034449)
+    ############################################################
 
-            # Get match values (prefix and/or suffix may contribute to making name unique)
-            
-            (self.prefix, self.panel, self.x, self.y, self.tagType, self.suffix, endSep) = m.groups()
+    def parseHelicos(self, m=None):
 
-            # Set defline name
+        m = m or self.helicos.match(self.deflineString)
+        
+        # Confirm regular expression succeeded
+        
+        if m is None :
+            self.isValid = False
+            return self.isValid
 
-            if self.abiTitle:
-                self.name = self.abiTitle + "_" + self.prefix + self.panel + "_" + self.x + "_" + self.y
-            else:
-                self.name = self.prefix + self.panel + "_" + self.x + "_" + self.y
+        # Get match values
+        
+        (self.flowcell, self.channel, self.field, self.camera, self.position, endSep) = m.groups()
 
-            # Retain defline type if desired
+        # Set defline name
 
-            if ( not self.deflineType and
-                 self.saveDeflineType ):
-                self.deflineType = self.ABSOLID
-                self.platform = "ABSOLID"
+        self.name = "".join( ( self.flowcell, "-", self.channel, "-", self.field, "-", self.camera, "-", self.position ) )
 
-        ############################################################
-        # New Illumina
-        #
-        # @M00730:68:000000000-A2307:1:1101:14701:1383 1:N:0:1 (XXX574591)
-        # @HWI-962:74:C0K69ACXX:8:2104:14888:94110 2:N:0:CCGATAT (XXX610048)
-        # @HWI-ST808:130:H0B8YADXX:1:1101:1914:2223 1:N:0:NNNNNN-GGTCCA-AAAA (YYY1106612)
-        # @HWI-M01380:63:000000000-A8KG4:1:1101:17932:1459 1:N:0:Alpha29 CTAGTACG|0|GTAAGGAG|0 (SRR1767413)
-        # @HWI-ST959:56:D0AW4ACXX:8:1101:1233:2026 2:N:0: (XXX770604)
-        # @DJB77P1:546:H8V5MADXX:2:1101:11528:3334 1:N:0:_I_GACGAC (WWW000015)
-        # @HET-141-007:154:C391TACXX:6:1216:12924:76893 1:N:0 (WWW000006)
-        # @DG7PMJN1:293:D12THACXX:2:1101:1161:1968_1:N:0:GATCAG (XXX998303)
-        # @M01321:49:000000000-A6HWP:1:1101:17736:2216_1:N:0:1/M01321:49:000000000-A6HWP:1:1101:17736:2216_2:N:0:1 (WWW000016)
-        # @MISEQ:36:000000000-A5BCL:1:1101:24982:8584;smpl=12;brcd=ACTTTCCCTCGA 1:N:0:ACTTTCCCTCGA (WWW000026)
-        # @HWI-ST1234:33:D1019ACXX:2:1101:1415:2223/1 1:N:0:ATCACG (XXX1692309)
-        # @aa,HWI-7001455:146:H97PVADXX:2:1101:1498:2093 1:Y:0:ACAAACGGAGTTCCGA (WWW000027)
-        # @NS500234:97:HC75GBGXX:1:11101:6479:1067 1:N:0:ATTCAG+NTTCGC (WWW000028)
-        # @M01388:38:000000000-A49F2:1:1101:14022:1748 1:N:0:0 (WWW000029)
-        # @M00388:100:000000000-A98FW:1:1101:17578:2134 1:N:0:1|isu|119|c95|303 (WWW000030)
-        # @HISEQ:191:H9BYTADXX:1:1101:1215:1719 1:N:0:TTAGGC##NGTCCG (WWW000031)
-        # @HWI:1:X:1:1101:1298:2061 1:N:0: AGCGATAG (barcode is discarded) (WWW000039)
-        # @8:1101:1486:2141 1:N:0:/1 (WWW000033)
-        # @HS2000-1017_69:7:2203:18414:13643|2:N:O:GATCAG (WWW000045)
-        # @HISEQ:258:C6E8AANXX:6:1101:1823:1979:CGAGCACA:1:N:0:CGAGCACA:NG:GT (SRR3156573)
-        # @HWI-ST226:170:AB075UABXX:3:1101:1436:2127 1:N:0:GCCAAT (XXX104658)
-        # @HISEQ06:187:C0WKBACXX:6:1101:1198:2254 1:N:0: (XXX788729)
-        ############################################################
+        # Retain defline type if desired
 
-        elif ( self.deflineType == self.ILLUMINA_NEW or
-               self.deflineType == self.ILLUMINA_NEW_DOUBLE or
-               self.deflineType == self.ILLUMINA_NEW_OLD or
-               ( self.deflineType is None and
-                 ( self.illuminaNew.match(self.deflineString) or
-                   self.illuminaNewWithJunk.match(self.deflineString) or
-                   self.illuminaNewNoPrefix.match(self.deflineString) or
-                   self.illuminaNewWithUnderscores.match(self.deflineString) ) ) ):
-
-            if self.deflineType:
-                m = self.illuminaNew.match(self.deflineString)
-            else:
-                if self.illuminaNew.match(self.deflineString):
-                    m = self.illuminaNew.match(self.deflineString)
-                    self.foundRE = self.illuminaNew
-                elif self.illuminaNewNoPrefix.match(self.deflineString):
-                    m = self.illuminaNewNoPrefix.match(self.deflineString)
-                    self.foundRE = self.illuminaNewNoPrefix
-                elif self.illuminaNewWithJunk.match(self.deflineString):
-                    m = self.illuminaNewWithJunk.match(self.deflineString)
-                    self.foundRE = self.illuminaNewWithJunk
-                else:
-                    m = self.illuminaNewWithUnderscores.match(self.deflineString)
-                    self.foundRE = self.illuminaNewWithUnderscores
+        if ( not self.deflineType and
+             self.saveDeflineType ):
+            self.deflineType = self.HELICOS
+            self.platform = "HELICOS"
 
-                # Must set these here because last check may not be executed
-                
-                if self.saveDeflineType:
-                    self.illuminaNew = self.foundRE
-                    self.platform = "ILLUMINA"
+    ############################################################
+    # ab solid
+    #
+    # >3_189_730_F3 (XXX001662)
+    # >3_189_730_R3 (XXX001662)
+    # >461_28_1048_F3 (XXX001354)
+    # >349_1793_467_F3 (XXX015374)
+    # >1_98_123_BC (XXX1001434)
+    # >427_21_101_F3 (XXX112693)
+    # >427_17_22_F5-P2 (XXX112693)
+    # >2_35_407_F3 (XXX3159530)
+    # >2_35_407_F5-BC (XXX3159530)
+    # @1_43_495_F3 (XXX645822)
+    # @1_43_495_F5-BC (XXX645822)
+    # >47_15_207_F5-RNA (YYY005001)
+    # >47_15_207_F5-DNA (YYY005002)
+    # >1_01_1_23_192_F3 (YYY3222665)
+    # >1_23_192_F3_1_01 (ZZZ3222665)
+    # >427_27_224_F3 1:0003213231 (ZZZ005000)
+    ############################################################
 
-            # Confirm regular expression succeeded
-            
-            if m is None :
-                self.isValid = False
-                return self.isValid
-            
-            (self.prefix, sep1, self.lane, sep2, self.tile, sep3, self.x, sep4, self.y, sep5,
-             self.readNum, self.filterRead, reserved, self.spotGroup, endSep ) = m.groups()
+    def parseAbSolid(self, m=None):
 
-            # Capture info in sep5 as suffix
+        m = m or self.abSolid.match(self.deflineString)
+        
+        # Confirm regular expression succeeded
+        
+        if m is None :
+            self.isValid = False
+            return self.isValid
 
-            if ( sep5 is not None and
-                 len(sep5) > 2 ):
-                s = self.illuminaNewSuffix.match ( sep5 )
-                if s is not None:
-                    ( discard1, discard2, self.suffix, discard3, discard4, discard5, discard6 ) = s.groups()
+        # Get match values (prefix and/or suffix may contribute to making name unique)
+        
+        (self.prefix, self.panel, self.x, self.y, self.tagType, self.suffix, endSep) = m.groups()
 
-            # Value of 0 for spot group is equivalent to no spot group
+        # Set defline name
 
-            if self.spotGroup == "0":
-                self.spotGroup = ''
+        if self.abiTitle:
+            self.name = "".join( ( self.abiTitle, "_", self.prefix, self.panel, "_", self.x, "_", self.y ) )
+        else:
+            self.name = "".join( ( self.prefix, self.panel, "_", self.x, "_", self.y ) )
+
+        # Retain defline type if desired
+
+        if ( not self.deflineType and
+             self.saveDeflineType ):
+            self.deflineType = self.ABSOLID
+            self.platform = "ABSOLID"
+
+    ############################################################
+    # New Illumina
+    #
+    # @M00730:68:000000000-A2307:1:1101:14701:1383 1:N:0:1 (XXX574591)
+    # @HWI-962:74:C0K69ACXX:8:2104:14888:94110 2:N:0:CCGATAT (XXX610048)
+    # @HWI-ST808:130:H0B8YADXX:1:1101:1914:2223 1:N:0:NNNNNN-GGTCCA-AAAA (YYY1106612)
+    # @HWI-M01380:63:000000000-A8KG4:1:1101:17932:1459 1:N:0:Alpha29 CTAGTACG|0|GTAAGGAG|0 (SRR1767413)
+    # @HWI-ST959:56:D0AW4ACXX:8:1101:1233:2026 2:N:0: (XXX770604)
+    # @DJB77P1:546:H8V5MADXX:2:1101:11528:3334 1:N:0:_I_GACGAC (WWW000015)
+    # @HET-141-007:154:C391TACXX:6:1216:12924:76893 1:N:0 (WWW000006)
+    # @DG7PMJN1:293:D12THACXX:2:1101:1161:1968_1:N:0:GATCAG (XXX998303)
+    # @M01321:49:000000000-A6HWP:1:1101:17736:2216_1:N:0:1/M01321:49:000000000-A6HWP:1:1101:17736:2216_2:N:0:1 (WWW000016)
+    # @MISEQ:36:000000000-A5BCL:1:1101:24982:8584;smpl=12;brcd=ACTTTCCCTCGA 1:N:0:ACTTTCCCTCGA (WWW000026)
+    # @HWI-ST1234:33:D1019ACXX:2:1101:1415:2223/1 1:N:0:ATCACG (XXX1692309)
+    # @aa,HWI-7001455:146:H97PVADXX:2:1101:1498:2093 1:Y:0:ACAAACGGAGTTCCGA (WWW000027)
+    # @NS500234:97:HC75GBGXX:1:11101:6479:1067 1:N:0:ATTCAG+NTTCGC (WWW000028)
+    # @M01388:38:000000000-A49F2:1:1101:14022:1748 1:N:0:0 (WWW000029)
+    # @M00388:100:000000000-A98FW:1:1101:17578:2134 1:N:0:1|isu|119|c95|303 (WWW000030)
+    # @HISEQ:191:H9BYTADXX:1:1101:1215:1719 1:N:0:TTAGGC##NGTCCG (WWW000031)
+    # @HWI:1:X:1:1101:1298:2061 1:N:0: AGCGATAG (barcode is discarded) (WWW000039)
+    # @8:1101:1486:2141 1:N:0:/1 (WWW000033)
+    # @HS2000-1017_69:7:2203:18414:13643|2:N:O:GATCAG (WWW000045)
+    # @HISEQ:258:C6E8AANXX:6:1101:1823:1979:CGAGCACA:1:N:0:CGAGCACA:NG:GT (SRR3156573)
+    # @HWI-ST226:170:AB075UABXX:3:1101:1436:2127 1:N:0:GCCAAT (XXX104658)
+    # @HISEQ06:187:C0WKBACXX:6:1101:1198:2254 1:N:0: (XXX788729)
+    ############################################################
+
+    def parseIlluminaNew(self, m=None):
+
+        # Detection passes in the match from whichever new Illumina
+        # pattern succeeded. Must retain it here because the last
+        # check below may not be executed.
+
+        if self.deflineType:
+            m = self.illuminaNew.match(self.deflineString)
+        elif m:
+            self.foundRE = m.re
+            if self.saveDeflineType:
+                self.illuminaNew = self.foundRE
+                self.platform = "ILLUMINA"
 
-            # Set defline name
+        # Confirm regular expression succeeded
+        
+        if m is None :
+            self.isValid = False
+            return self.isValid
+        
+        (self.prefix, sep1, self.lane, sep2, self.tile, sep3, self.x, sep4, self.y, sep5,
+         self.readNum, self.filterRead, reserved, self.spotGroup, endSep ) = m.groups()
 
-            if self.prefix:
-                self.name = self.prefix + sep1 + self.lane + sep2 + self.tile + sep3 + self.x + sep4 + self.y
-            else:
-                self.name = self.lane + sep2 + self.tile + sep3 + self.x + sep4 + self.y
-
-            # Check for doubled-up defline for both reads
-            # Potential for mixed double-up and fragment deflines, too.
-            # So setting to self.ILLUMINA_NEW_DOUBLE on first occurrence
-            # Assuming single character separator between the two names.
-
-            if ( self.deflineType == self.ILLUMINA_NEW_DOUBLE or
-                 ( not self.deflineType and
-                   len(self.spotGroup) > len(self.name) and
-                   re.search( re.escape(self.name), self.spotGroup) ) ):
-                if (sys.version).startswith("3"):
-                    start = str.find(self.spotGroup,self.name)
-                else:
-                    start = string.find(self.spotGroup,self.name)
-                if start != -1:
-                    self.spotGroup = self.spotGroup[0:start-1]
-                    if self.saveDeflineType:
-                        self.deflineType = self.ILLUMINA_NEW_DOUBLE
+        # Capture info in sep5 as suffix
 
-            # Check for and remove read numbers after spot group
-            
-            elif ( self.deflineType == self.ILLUMINA_NEW_OLD or
-                   ( not self.deflineType and
-                     re.search ( "/[1234]$",self.spotGroup ) ) ):
-                self.spotGroup = self.spotGroup[0:len(self.spotGroup)-2]
-                if self.saveDeflineType:
-                    self.deflineType = self.ILLUMINA_NEW_OLD
+        if ( sep5 is not None and
+             len(sep5) > 2 ):
+            s = self.illuminaNewSuffix.match ( sep5 )
+            if s is not None:
+                ( discard1, discard2, self.suffix, discard3, discard4, discard5, discard6 ) = s.groups()
 
-            # Set filter value better
+        # Value of 0 for spot group is equivalent to no spot group
 
-            if self.filterRead == 'Y':
-                self.filterRead = 1
-            else:
-                self.filterRead = 0
+        if self.spotGroup == "0":
+            self.spotGroup = ''
 
-            # Save defline type if not previously set (must be here)
-            
-            if ( not self.deflineType and
-                 self.saveDeflineType ):
-                self.deflineType = self.ILLUMINA_NEW
+        # Set defline name. Prefix through y are adjacent groups, so
+        # the name is a single slice of the defline string.
 
-        ############################################################
-        # Old Illumina
-        #
-        # @HWIEAS210R_0014:3:28:1070:11942#ATCCCG/1 (XXX799414)
-        # @FCABM5A:1:1101:15563:1926#CTAGCGCT_CATTGCTT/1 (WWW000014)
-        # @HWI-ST1374:1:1101:1161:2060#0/1 (XXX001101)
-        # @ID57_120908_30E4FAAXX:3:1:1772:953/1 (XXX020199)
-        # @HWI-EAS30_2_FC200HWAAXX_4_1_646_399^M (XXX013586)
-        # @R1:1:221:197:649/1 (YYY003002)
-        # @R16:8:1:0:1617#0/1^M (YYY003003)
-        # @7:1:792:533 (YYY013547)
-        # @7:1:164:-0 (YYY013547)
-        # @HWUSI-BETA8_3:7:1:-1:14 (YYY015261)
-        # @rumen9533:0:0:0:5 (YYY020795)
-        # @IL10_334:1:1:4:606 (YYY036999)
-        # @HWUSI-EAS517-74:3:1:1023:8178/1 ~ RGR:Uk6; (WWW000002)
-        # @FCC19K2ACXX:3:1101:1485:2170#/1 (WWW000017)
-        # @MB27-02-1:1101:1723:2171 /1 (WWW000003)
-        # @AMS2007273_SHEN-MISEQ01:47:1:1:12958:1771:0:1#0 (WWW000008)
-        # @AMS2007273_SHEN-MISEQ01:47:1:1:17538:1769:0:0#0 (WWW000008)
-        # @120315_SN711_0193_BC0KW7ACXX:1:1101:1419:2074:1#0/1 (WWW000001)
-        # @ATGCT_7_1101_1418_2098_1 (WWW000007)
-        # HWI-ST155_0544:1:1:6804:2058#0/1 (SINGLE LINE FASTQ SO NO '@') (YYY003101)
-        # @HWI-ST225:626:C2Y82ACXX:3:1208:2931:82861_1 (WWW000040)
-        # >M01056:83:000000000-A7GBN:1:1108:17094:2684--W1 (WWW000019)
-        # @D3LH75P1:1:1101:1054:2148:0 1:1 (WWW000032)
-        # @HWI-IT879:92:5:1101:1170:2026#0/1:0 (WWW000037)
-        # @HWI-ST225:626:C2Y82ACXX:3:1208:2222:82880_1 (WWW000040)
-        # @FCA5PJ4:1:1101:14707:1407#GTAGTCGC_AGCTCGGT/1 (SRR2006030)
-        # @SOLEXA-GA02_1:1:1:0:106 (ERR011021)
-        # @HWUSI-EAS499:1:3:9:1822#0/1 (XXX000093)
-        # @BILLIEHOLIDAY_1_FC20F3DAAXX:8:2:342:540 (XXX013565)
-        # @BILLIEHOLIDAY_1_FC200TYAAXX_3_1_751_675 (XXX013571)
-        # @HWI-EAS30_2_FC20416AAXX_7_1_116_317 (XXX013600)
-        # >KN-930:1:1:653:356 (XXX014056)
-        # USI-EAS50_1:6:1:392:881 (XXX014283)
-        # @FC12044_91407_8_1_46_673 (XXX015015)
-        # @HWI-EAS299_2_30MNAAAXX:5:1:936:1505/1 (XXX015076)
-        # @HWI-EAS-249:7:1:1:443/1 (XXX037956)
-        # @741:6:1:1204:10747/1 (XXX094419)
-        # @HWI-EAS385_0086_FC:1:1:1239:943#0/1 (XXX488373)
-        # @HWUSI-EAS613-R_0001:8:1:1020:14660#0/1 (XXX556206)
-        # @ILLUMINA-D01686_0001:7:1:1028:14175#0/1 (XXX567550)
-        # @1920:1:1:1504:1082/1 (XXX627950)
-        # @HWI-EAS397_0013:1:1:1083:11725#0/1 (XXX651965)
-        # >HWI-EAS6_4_FC2010T:1:1:80:366 (YYY001656)
-        # @NUTELLA_42A08AAXX:4:001:0003:0089/1 (YYY003100)
-        # @R16:8:1:0:875#0/1 (YYY014126)
-        # HWI-EAS102_1_30LWPAAXX:5:1:1456:776 (YYY016872)
-        # @HWI-EAS390_30VGNAAXX1:1:1:377:1113/1 (YYY020188)
-        # @ID57_120908_30E4FAAXX:3:1:1772:953/1 (YYY020203)
-        # HWI-EAS440_102:8:1:168:1332 (YYY029167)
-        # @SNPSTER4_246_30GCDAAXX_PE:1:1:3:896/1 (YYY029194)
-        # @FC42AUBAAXX:6:1:4:1280#TGACCA/1 (YYY030833)
-        # @SOLEXA9:1:1:1:2005#0/1 (YYY037749)
-        # @SNPSTER3_264_30JGGAAXX_PE:2:1:218:311/1 (YYY058403)
-        # @HWUSI-EAS535_0001:7:1:747:14018#0/1 (YYY065453)
-        # @FC42ATTAAXX:5:1:0:20481 (YYY066636)
-        # @HWUSI-EAS1571_0012:8:1:1017:20197#0/1 (YYY089777)
-        # @SOLEXA1_0052_FC:8:1:1508:1078#TTAGGC/1 (YYY171628)
-        ############################################################
+        if self.prefix:
+            self.name = self.deflineString[ m.start(1) : m.end(9) ]
+        else:
+            self.name = self.deflineString[ m.start(3) : m.end(9) ]
+
+        # Check for doubled-up defline for both reads
+        # Potential for mixed double-up and fragment deflines, too.
+        # So setting to self.ILLUMINA_NEW_DOUBLE on first occurrence
+        # Assuming single character separator between the two names.
+
+        if ( self.deflineType == self.ILLUMINA_NEW_DOUBLE or
+             ( not self.deflineType and
+               len(self.spotGroup) > len(self.name) and
+               self.name in self.spotGroup ) ):
+            start = self.spotGroup.find(self.name)
+            if start != -1:
+                self.spotGroup = self.spotGroup[:start-1]
+                if self.saveDeflineType:
+                    self.deflineType = self.ILLUMINA_NEW_DOUBLE
 
-        elif ( self.deflineType == self.ILLUMINA_OLD or
-               ( self.deflineType is None and
-                 ( self.illuminaOldColon.match ( self.deflineString ) or
-                   self.illuminaOldUnderscore.match ( self.deflineString ) or
-                   self.illuminaOldNoPrefix.match ( self.deflineString ) or
-                   self.illuminaOldWithJunk2.match ( self.deflineString ) ) ) ) :
-
-            # For first time around check for need to identify appropriate separator
-            # Retain defline type if desired and not set and count extra numbers in name
-            # Retain appropriate pattern. Note that illumina old with junk comes first
-            # because illumina old colon pattern will always match that case, too.
-
-            if self.deflineType:
-                m = self.illuminaOld.match ( self.deflineString )
-            elif self.illuminaOldWithJunk.match ( self.deflineString ):
-                m = self.illuminaOldWithJunk.match ( self.deflineString )
-                self.foundRE = self.illuminaOldWithJunk
-            elif self.illuminaOldColon.match ( self.deflineString ) :
-                m = self.illuminaOldColon.match ( self.deflineString )
-                self.foundRE = self.illuminaOldColon
-            elif self.illuminaOldUnderscore.match ( self.deflineString ):
-                m = self.illuminaOldUnderscore.match ( self.deflineString )
-                self.foundRE = self.illuminaOldUnderscore
-            elif self.illuminaOldWithJunk2.match ( self.deflineString ):
-                m = self.illuminaOldWithJunk2.match ( self.deflineString )
-                self.foundRE = self.illuminaOldWithJunk2
-            else:
-                m = self.illuminaOldNoPrefix.match ( self.deflineString )
-                self.foundRE = self.illuminaOldNoPrefix
-                    
-            # Confirm regular expression succeeded
-            
-            if m is None :
-                self.isValid = False
-                return self.isValid
+        # Check for and remove read numbers after spot group
+        
+        elif ( self.deflineType == self.ILLUMINA_NEW_OLD or
+               ( not self.deflineType and
+                 self.spotGroup.endswith( ( "/1", "/2", "/3", "/4" ) ) ) ):
+            self.spotGroup = self.spotGroup[:-2]
+            if self.saveDeflineType:
+                self.deflineType = self.ILLUMINA_NEW_OLD
 
-            # Collect values from regular expression pattern
-            
-            (self.prefix, sep1, self.lane, sep2, self.tile, sep3, self.x, sep4, self.y,
-             self.spotGroup, self.readNum, endSep) = m.groups()
-            if self.readNum:
-                self.readNum = self.readNum[1:]
+        # Set filter value better
 
-            # Check for suffix
+        self.filterRead = 1 if self.filterRead == 'Y' else 0
 
-            s = self.illuminaOldSuffix.match ( self.y )
-            if s:
-                ( self.y, self.suffix ) = s.groups()
-                if len(self.suffix) < 3:
-                    self.suffix = None
+        # Save defline type if not previously set (must be here)
+        
+        if ( not self.deflineType and
+             self.saveDeflineType ):
+            self.deflineType = self.ILLUMINA_NEW
+
+    ############################################################
+    # Old Illumina
+    #
+    # @HWIEAS210R_0014:3:28:1070:11942#ATCCCG/1 (XXX799414)
+    # @FCABM5A:1:1101:15563:1926#CTAGCGCT_CATTGCTT/1 (WWW000014)
+    # @HWI-ST1374:1:1101:1161:2060#0/1 (XXX001101)
+    # @ID57_120908_30E4FAAXX:3:1:1772:953/1 (XXX020199)
+    # @HWI-EAS30_2_FC200HWAAXX_4_1_646_399^M (XXX013586)
+    # @R1:1:221:197:649/1 (YYY003002)
+    # @R16:8:1:0:1617#0/1^M (YYY003003)
+    # @7:1:792:533 (YYY013547)
+    # @7:1:164:-0 (YYY013547)
+    # @HWUSI-BETA8_3:7:1:-1:14 (YYY015261)
+    # @rumen9533:0:0:0:5 (YYY020795)
+    # @IL10_334:1:1:4:606 (YYY036999)
+    # @HWUSI-EAS517-74:3:1:1023:8178/1 ~ RGR:Uk6; (WWW000002)
+    # @FCC19K2ACXX:3:1101:1485:2170#/1 (WWW000017)
+    # @MB27-02-1:1101:1723:2171 /1 (WWW000003)
+    # @AMS2007273_SHEN-MISEQ01:47:1:1:12958:1771:0:1#0 (WWW000008)
+    # @AMS2007273_SHEN-MISEQ01:47:1:1:17538:1769:0:0#0 (WWW000008)
+    # @120315_SN711_0193_BC0KW7ACXX:1:1101:1419:2074:1#0/1 (WWW000001)
+    # @ATGCT_7_1101_1418_2098_1 (WWW000007)
+    # HWI-ST155_0544:1:1:6804:2058#0/1 (SINGLE LINE FASTQ SO NO '@') (YYY003101)
+    # @HWI-ST225:626:C2Y82ACXX:3:1208:2931:82861_1 (WWW000040)
+    # >M01056:83:000000000-A7GBN:1:1108:17094:2684--W1 (WWW000019)
+    # @D3LH75P1:1:1101:1054:2148:0 1:1 (WWW000032)
+    # @HWI-IT879:92:5:1101:1170:2026#0/1:0 (WWW000037)
+    # @HWI-ST225:626:C2Y82ACXX:3:1208:2222:82880_1 (WWW000040)
+    # @FCA5PJ4:1:1101:14707:1407#GTAGTCGC_AGCTCGGT/1 (SRR2006030)
+    # @SOLEXA-GA02_1:1:1:0:106 (ERR011021)
+    # @HWUSI-EAS499:1:3:9:1822#0/1 (XXX000093)
+    # @BILLIEHOLIDAY_1_FC20F3DAAXX:8:2:342:540 (XXX013565)
+    # @BILLIEHOLIDAY_1_FC200TYAAXX_3_1_751_675 (XXX013571)
+    # @HWI-EAS30_2_FC20416AAXX_7_1_116_317 (XXX013600)
+    # >KN-930:1:1:653:356 (XXX014056)
+    # USI-EAS50_1:6:1:392:881 (XXX014283)
+    # @FC12044_91407_8_1_46_673 (XXX015015)
+    # @HWI-EAS299_2_30MNAAAXX:5:1:936:1505/1 (XXX015076)
+    # @HWI-EAS-249:7:1:1:443/1 (XXX037956)
+    # @741:6:1:1204:10747/1 (XXX094419)
+    # @HWI-EAS385_0086_FC:1:1:1239:943#0/1 (XXX488373)
+    # @HWUSI-EAS613-R_0001:8:1:1020:14660#0/1 (XXX556206)
+    # @ILLUMINA-D01686_0001:7:1:1028:14175#0/1 (XXX567550)
+    # @1920:1:1:1504:1082/1 (XXX627950)
+    # @HWI-EAS397_0013:1:1:1083:11725#0/1 (XXX651965)
+    # >HWI-EAS6_4_FC2010T:1:1:80:366 (YYY001656)
+    # @NUTELLA_42A08AAXX:4:001:0003:0089/1 (YYY003100)
+    # @R16:8:1:0:875#0/1 (YYY014126)
+    # HWI-EAS102_1_30LWPAAXX:5:1:1456:776 (YYY016872)
+    # @HWI-EAS390_30VGNAAXX1:1:1:377:1113/1 (YYY020188)
+    # @ID57_120908_30E4FAAXX:3:1:1772:953/1 (YYY020203)
+    # HWI-EAS440_102:8:1:168:1332 (YYY029167)
+    # @SNPSTER4_246_30GCDAAXX_PE:1:1:3:896/1 (YYY029194)
+    # @FC42AUBAAXX:6:1:4:1280#TGACCA/1 (YYY030833)
+    # @SOLEXA9:1:1:1:2005#0/1 (YYY037749)
+    # @SNPSTER3_264_30JGGAAXX_PE:2:1:218:311/1 (YYY058403)
+    # @HWUSI-EAS535_0001:7:1:747:14018#0/1 (YYY065453)
+    # @FC42ATTAAXX:5:1:0:20481 (YYY066636)
+    # @HWUSI-EAS1571_0012:8:1:1017:20197#0/1 (YYY089777)
+    # @SOLEXA1_0052_FC:8:1:1508:1078#TTAGGC/1 (YYY171628)
+    ############################################################
+
+    def parseIlluminaOld(self, m=None):
+
+        # For first time around check for need to identify appropriate separator
+        # Retain defline type if desired and not set and count extra numbers in name
+        # Detection passes in the match from whichever old Illumina pattern
+        # succeeded first. Note that illumina old with junk is tried first
+        # because illumina old colon pattern will always match that case, too.
+
+        if self.deflineType:
+            m = self.illuminaOld.match ( self.deflineString )
+        elif m:
+            self.foundRE = m.re
+                
+        # Confirm regular expression succeeded
+        
+        if m is None :
+            self.isValid = False
+            return self.isValid
 
-            # Determine number of discards first time through
-            
-            if ( not self.deflineType and
-                 self.prefix) :
-                self.numDiscards = self.countExtraNumbersInIllumina(sep4)
+        # Collect values from regular expression pattern
+        
+        (self.prefix, sep1, self.lane, sep2, self.tile, sep3, self.x, sep4, self.y,
+         self.spotGroup, self.readNum, endSep) = m.groups()
+        if self.readNum:
+            self.readNum = self.readNum[1:]
 
-            # Discard extra numbers (which can cause a difference between pair deflines)
-            # and set defline name
+        # Check for suffix
 
-            if self.numDiscards > 0:
-                
-                if self.numDiscards == 1:
-                    self.y = self.x
-                    self.x = self.tile
-                    self.tile = self.lane
-                    m2 = re.match("([!-~]*?)(" + sep4 + ")(\d+)$", self.prefix)
-                    if m2:
-                        (self.prefix,sep0,self.lane) = m2.groups()
-                        self.name = self.prefix + sep0 + self.lane + sep1 + self.tile + sep2 + self.x + sep3 + self.y
-                    else:
-                        self.lane = self.prefix
-                        self.prefix = ""
-                        self.name = self.lane + sep1 + self.tile + sep2 + self.x + sep3 + self.y
+        s = self.illuminaOldSuffix.match ( self.y )
+        if s:
+            ( self.y, self.suffix ) = s.groups()
+            if len(self.suffix) < 3:
+                self.suffix = None
 
-                elif self.numDiscards == 2:
-                    self.y = self.tile
-                    self.x = self.lane
-                    m2 = re.match("([!-~]*?)(" + sep4 + ")(\d+)(" + sep4 + ")(\d+)(\s+|$)",self.prefix)
-                    if m2:
-                        (self.prefix,sep_1,self.lane,sep0,self.tile,sepUnused) = m2.groups()
-                        self.name = self.prefix + sep_1 + self.lane + sep0 + self.tile + sep1 + self.x + sep2 + self.y
-                    else:
-                        m2 = re.match("(\d+)(" + sep4 + ")(\d+)(\s+|$)",self.prefix)
-                        if m2:
-                            (self.lane,sep0,self.tile,sepUnused) = m2.groups()
-                            self.prefix = ""
-                            self.name = self.lane + sep0 + self.tile + sep1 + self.x + sep2 + self.y
+        # Determine number of discards first time through
+        
+        if ( not self.deflineType and
+             self.prefix) :
+            self.numDiscards = self.countExtraNumbersInIllumina(sep4)
 
-            # If no discards and prefix exists, set name including prefix
-            
-            elif self.prefix:
-                self.name = self.prefix + sep1 + self.lane + sep2 + self.tile + sep3 + self.x + sep4 + self.y
+        # Discard extra numbers (which can cause a difference between pair deflines)
+        # and set defline name
 
-            # If no discards and no prefix, set name without prefix
+        if self.numDiscards > 0:
             
-            else:
-                self.name = self.lane + sep2 + self.tile + sep3 + self.x + sep4 + self.y
+            if self.numDiscards == 1:
+                self.y = self.x
+                self.x = self.tile
+                self.tile = self.lane
+                m2 = self.illuminaOldDiscard1[sep4].match(self.prefix)
+                if m2:
+                    (self.prefix,sep0,self.lane) = m2.groups()
+                    self.name = "".join( ( self.prefix, sep0, self.lane, sep1, self.tile, sep2, self.x, sep3, self.y ) )
+                else:
+                    self.lane = self.prefix
+                    self.prefix = ""
+                    self.name = "".join( ( self.lane, sep1, self.tile, sep2, self.x, sep3, self.y ) )
+
+            elif self.numDiscards == 2:
+                self.y = self.tile
+                self.x = self.lane
+                m2 = self.illuminaOldDiscard2[sep4].match(self.prefix)
+                if m2:
+                    (self.prefix,sep_1,self.lane,sep0,self.tile,sepUnused) = m2.groups()
+                    self.name = "".join( ( self.prefix, sep_1, self.lane, sep0, self.tile, sep1, self.x, sep2, self.y ) )
+                else:
+                    m2 = self.illuminaOldDiscard2NoPrefix[sep4].match(self.prefix)
+                    if m2:
+                        (self.lane,sep0,self.tile,sepUnused) = m2.groups()
+                        self.prefix = ""
+                        self.name = "".join( ( self.lane, sep0, self.tile, sep1, self.x, sep2, self.y ) )
 
-            # Remove # from front of spot group if present
-            # Value of 0 for spot group is equivalent to no spot group
+        # If no discards and prefix exists, set name including prefix
+        
+        elif self.prefix:
+            self.name = "".join( ( self.prefix, sep1, self.lane, sep2, self.tile, sep3, self.x, sep4, self.y ) )
 
-            if self.spotGroup:
-                self.spotGroup = self.spotGroup[1:]
-            
-            if self.spotGroup == "0":
-                self.spotGroup = ''
+        # If no discards and no prefix, set name without prefix
+        
+        else:
+            self.name = "".join( ( self.lane, sep2, self.tile, sep3, self.x, sep4, self.y ) )
 
-            # Save defline type and regular expression (must occur after determination of numDiscards)
+        # Remove # from front of spot group if present
+        # Value of 0 for spot group is equivalent to no spot group
 
-            if ( not self.deflineType and
-                 self.saveDeflineType ):
-                self.illuminaOld = self.foundRE
+        if self.spotGroup:
+            self.spotGroup = self.spotGroup[1:]
+        
+        if self.spotGroup == "0":
+            self.spotGroup = ''
+
+        # Save defline type and regular expression (must occur after determination of numDiscards)
+
+        if ( not self.deflineType and
+             self.saveDeflineType ):
+            self.illuminaOld = self.foundRE
+            self.platform = "ILLUMINA"
+            self.deflineType = self.ILLUMINA_OLD
+
+    ############################################################
+    # qiime with new illumina (only first spot qiime name retained)
+    #
+    # @B11.13210.SIV.Barouch.Stool.250.06.8.13.12_5644 M00181:229:000000000-AAPUA:1:1101:9433:3327 1:N:0:1 orig_bc=TGACCTCCTAGA new_bc=TGACCTCCAAGA bc_diffs=1 (YYY908068)
+    # @2wkRT.79_123 M00176:18:000000000-A0DK4:1:1:13923:1732 1:N:0:0 orig_bc=ATGCTAACCACG new_bc=ATGCTAACCACG bc_diffs=0 (XXX776282)
+    # @ HWI-M01929:28:000000000-A6VG4:1:2109:8848:7133 1:N:0:GTGTT  orig_bc=GCTTA   new_bc=GCTTA    bc_diffs=0 (WWW000005)
+    # @cp2  :1:1101:17436:1559:1:N:0:5/1_:1:1101:17436:1559:2:N:0:5/2   124 124 (WWW000020)
+    # @10_194156 HWI-M02808:46:AAHRM:1:1101:17744:1823 1:N:0:ATGAGACTCCAC orig_bc=ATGAGACTCCAC new_bc=ATGAGACTCCAC bc_diffs=0 (WWW000013)
+    # @AM-B-CON M02233:62:000000000-A9GLW:1:1101:15425:1859 1:N:0:111^M (WWW000024)
+    # >26.04.2015.WO.Comp.S55_1 M00596.112.000000000.AHGJM.1.1101.20901.1309 1.N.0.55 (SRR3112744)
+    # >PSF.1d.20_0 HISEQ:128:160215_SNL128_0128_AHJT2MBCXX:1:1101:3422:2184 1:N:0: orig_bc=TATAGCGACTACTATA new_bc=TATAGCGACTACTATA bc_diffs=0 (SRR3992252)
+    # @2-796964 M01929:5:000000000-A46YE:1:1108:16489:18207 1:N:0:2 (XXX1778155)
+    ############################################################
+
+    def parseQiimeIlluminaNew(self, m=None):
+
+        # Detection passes in the match from whichever qiime new Illumina
+        # pattern succeeded. Must retain it here because the last check
+        # below may not be executed.
+
+        if self.deflineType:
+            m = self.qiimeIlluminaNew.match ( self.deflineString )
+        elif m:
+            self.foundRE = m.re
+            if self.saveDeflineType:
+                self.qiimeIlluminaNew = self.foundRE
                 self.platform = "ILLUMINA"
-                self.deflineType = self.ILLUMINA_OLD
-
-        ############################################################
-        # qiime with new illumina (only first spot qiime name retained)
-        #
-        # @B11.13210.SIV.Barouch.Stool.250.06.8.13.12_5644 M00181:229:000000000-AAPUA:1:1101:9433:3327 1:N:0:1 orig_bc=TGACCTCCTAGA new_bc=TGACCTCCAAGA bc_diffs=1 (YYY908068)
-        # @2wkRT.79_123 M00176:18:000000000-A0DK4:1:1:13923:1732 1:N:0:0 orig_bc=ATGCTAACCACG new_bc=ATGCTAACCACG bc_diffs=0 (XXX776282)
-        # @ HWI-M01929:28:000000000-A6VG4:1:2109:8848:7133 1:N:0:GTGTT  orig_bc=GCTTA   new_bc=GCTTA    bc_diffs=0 (WWW000005)
-        # @cp2  :1:1101:17436:1559:1:N:0:5/1_:1:1101:17436:1559:2:N:0:5/2   124 124 (WWW000020)
-        # @10_194156 HWI-M02808:46:AAHRM:1:1101:17744:1823 1:N:0:ATGAGACTCCAC orig_bc=ATGAGACTCCAC new_bc=ATGAGACTCCAC bc_diffs=0 (WWW000013)
-        # @AM-B-CON M02233:62:000000000-A9GLW:1:1101:15425:1859 1:N:0:111^M (WWW000024)
-        # >26.04.2015.WO.Comp.S55_1 M00596.112.000000000.AHGJM.1.1101.20901.1309 1.N.0.55 (SRR3112744)
-        # >PSF.1d.20_0 HISEQ:128:160215_SNL128_0128_AHJT2MBCXX:1:1101:3422:2184 1:N:0: orig_bc=TATAGCGACTACTATA new_bc=TATAGCGACTACTATA bc_diffs=0 (SRR3992252)
-        # @2-796964 M01929:5:000000000-A46YE:1:1108:16489:18207 1:N:0:2 (XXX1778155)
-        ############################################################
 
-        elif ( self.deflineType == self.QIIME_ILLUMINA_NEW or
-               self.deflineType == self.QIIME_ILLUMINA_NEW_BC or
-               self.deflineType == self.QIIME_ILLUMINA_NEW_DBL or
-               self.deflineType == self.QIIME_ILLUMINA_NEW_DBL_BC or
-               ( self.deflineType is None and
-                 ( self.qiimeIlluminaNew.match(self.deflineString) or
-                   self.qiimeIlluminaNewPeriods.match(self.deflineString) or
-                   self.qiimeIlluminaNewUnderscores.match(self.deflineString) ) ) ):
-            
-            if self.deflineType:
-                m = self.qiimeIlluminaNew.match ( self.deflineString )
-            else:
-                if self.qiimeIlluminaNew.match ( self.deflineString ) :
-                    m = self.qiimeIlluminaNew.match ( self.deflineString )
-                    self.foundRE = self.qiimeIlluminaNew
-                elif self.qiimeIlluminaNewPeriods.match ( self.deflineString ):
-                    m = self.qiimeIlluminaNewPeriods.match ( self.deflineString )
-                    self.foundRE = self.qiimeIlluminaNewPeriods
-                else:
-                    m = self.qiimeIlluminaNewUnderscores.match ( self.deflineString )
-                    self.foundRE = self.qiimeIlluminaNewUnderscores
-                
-                # Must set here because last check may not be executed
-
-                if self.saveDeflineType:
-                    self.qiimeIlluminaNew = self.foundRE
-                    self.platform = "ILLUMINA"
+        # Confirm regular expression succeeded
+        
+        if m is None :
+            self.isValid = False
+            return self.isValid
 
-            # Confirm regular expression succeeded
-            
-            if m is None :
+        # Get match values
+        
+        (self.qiimeName, self.prefix, sep1, self.lane, sep2, self.tile, sep3, self.x, sep4, self.y, sep5,
+         self.readNum, self.filterRead, reserved, self.spotGroup, endSep ) = m.groups()
+
+        # Check for the presence of barcode corrections
+
+        m_bc = None
+        if ( self.deflineType == self.QIIME_ILLUMINA_NEW_BC or
+             not self.deflineType ):
+            m_bc = self.qiimeBc.match(self.deflineString)
+            if m_bc:
+                self.spotGroup = m_bc.group(2)
+            elif self.deflineType:
                 self.isValid = False
                 return self.isValid
 
-            # Get match values
-            
-            (self.qiimeName, self.prefix, sep1, self.lane, sep2, self.tile, sep3, self.x, sep4, self.y, sep5,
-             self.readNum, self.filterRead, reserved, self.spotGroup, endSep ) = m.groups()
-
-            # Check for the presence of barcode corrections
-
-            m_bc = None
-            if ( self.deflineType == self.QIIME_ILLUMINA_NEW_BC or
-                 ( not self.deflineType and
-                   self.qiimeBc.match(self.deflineString) ) ) :
-                m_bc = self.qiimeBc.match(self.deflineString)
-                if ( self.deflineType == self.QIIME_ILLUMINA_NEW_BC and
-                     m_bc is None ):
-                    self.isValid = False
-                    return self.isValid
-                else:
-                    self.spotGroup = m_bc.group(2)
-
-            # Set defline name
-
-            self.name = self.prefix + sep1 + self.lane + sep2 + self.tile + sep3 + self.x + sep4 + self.y
+        # Set defline name (prefix through y as a single slice)
+
+        self.name = self.deflineString[ m.start(2) : m.end(10) ]
+
+        # Check for doubled-up defline for both reads
+        # Potential for mixed double-up and fragment deflines, too.
+        # So setting to self.ILLUMINA_NEW_DOUBLE on first occurrence
+        # Assuming single character separator between the two names.
+
+        if ( self.deflineType == self.QIIME_ILLUMINA_NEW_DBL or
+             self.deflineType == self.QIIME_ILLUMINA_NEW_DBL_BC or
+             ( not self.deflineType and
+               len(self.spotGroup) > len(self.name) and
+               self.name in self.spotGroup ) ):
+            start = self.spotGroup.find(self.name)
+            if start != -1:
+                self.spotGroup = self.spotGroup[:start-1]
+                if ( "/1" in self.spotGroup or
+                     "/2" in self.spotGroup ):
+                    self.spotGroup = self.spotGroup[:-2]
+                if ( not self.deflineType and
+                     self.saveDeflineType ):
+                    if self.deflineType == self.QIIME_ILLUMINA_NEW_BC:
+                        self.deflineType = self.QIIME_ILLUMINA_NEW_DBL_BC
+                    else:
+                        self.deflineType = self.QIIME_ILLUMINA_NEW_DBL
 
-            # Check for doubled-up defline for both reads
-            # Potential for mixed double-up and fragment deflines, too.
-            # So setting to self.ILLUMINA_NEW_DOUBLE on first occurrence
-            # Assuming single character separator between the two names.
+        # Set filter value better
 
-            if ( self.deflineType == self.QIIME_ILLUMINA_NEW_DBL or
-                 self.deflineType == self.QIIME_ILLUMINA_NEW_DBL_BC or
-                 ( not self.deflineType and
-                   len(self.spotGroup) > len(self.name) and
-                   re.search( re.escape(self.name), self.spotGroup) ) ):
-                if (sys.version).startswith("3"):
-                    start = str.find(self.spotGroup,self.name)
-                else:
-                    start = string.find(self.spotGroup,self.name)
-                if start != -1:
-                    self.spotGroup = self.spotGroup[0:start-1]
-                    if re.search( "/[12]", self.spotGroup ):
-                        self.spotGroup = self.spotGroup[:len(self.spotGroup) - 2]
-                    if ( not self.deflineType and
-                         self.saveDeflineType ):
-                        if self.deflineType == self.QIIME_ILLUMINA_NEW_BC:
-                            self.deflineType = self.QIIME_ILLUMINA_NEW_DBL_BC
-                        else:
-                            self.deflineType = self.QIIME_ILLUMINA_NEW_DBL
+        self.filterRead = 1 if self.filterRead == 'Y' else 0
 
-            # Set filter value better
+        # Retain defline type if desired (must stay here)
 
-            if self.filterRead == 'Y':
-                self.filterRead = 1
+        if ( not self.deflineType and
+             self.saveDeflineType ):
+            if m_bc is None:
+                self.deflineType = self.QIIME_ILLUMINA_NEW
             else:
-                self.filterRead = 0
+                self.deflineType = self.QIIME_ILLUMINA_NEW_BC
 
-            # Retain defline type if desired (must stay here)
+    ############################################################
+    # qiime with old illumina (only first spot qiime name retained)
+    #
+    # @B11.13210.SIV.Barouch.Stool.250.06.8.13.12_378 M00181:229:000000000-AAPUA:1:1101:19450:2192#0/1 orig_bc=TGACCTCCAAGA new_bc=TGACCTCCAAGA bc_diffs=0 (ZZZ908068)
+    # @B11.13210.SIV.Barouch.Stool.250.06.8.13.12_158 M00181:229:000000000-AAPUA:1:1101:19450:2192#0/2 orig_bc=TGACCTCCAAGA new_bc=TGACCTCCAAGA bc_diffs=0 (ZZZ908068)
+    ############################################################
 
-            if ( not self.deflineType and
-                 self.saveDeflineType ):
-                if m_bc is None:
-                    self.deflineType = self.QIIME_ILLUMINA_NEW
-                else:
-                    self.deflineType = self.QIIME_ILLUMINA_NEW_BC
+    def parseQiimeIlluminaOld(self, m=None):
 
-        ############################################################
-        # qiime with old illumina (only first spot qiime name retained)
-        #
-        # @B11.13210.SIV.Barouch.Stool.250.06.8.13.12_378 M00181:229:000000000-AAPUA:1:1101:19450:2192#0/1 orig_bc=TGACCTCCAAGA new_bc=TGACCTCCAAGA bc_diffs=0 (ZZZ908068)
-        # @B11.13210.SIV.Barouch.Stool.250.06.8.13.12_158 M00181:229:000000000-AAPUA:1:1101:19450:2192#0/2 orig_bc=TGACCTCCAAGA new_bc=TGACCTCCAAGA bc_diffs=0 (ZZZ908068)
-        ############################################################
+        m = m or self.qiimeIlluminaOld.match(self.deflineString)
+        
+        # Confirm regular expression succeeded
+        
+        if m is None :
+            self.isValid = False
+            return self.isValid
 
-        elif ( self.deflineType == self.QIIME_ILLUMINA_OLD or
-               self.deflineType == self.QIIME_ILLUMINA_OLD_BC or
-               ( self.deflineType is None and
-                 self.qiimeIlluminaOld.match(self.deflineString) ) ):
-            
-            m = self.qiimeIlluminaOld.match(self.deflineString)
-            
-            # Confirm regular expression succeeded
-            
-            if m is None :
+        # Get match values
+        
+        (self.qiimeName, self.prefix, sep1, self.lane, sep2, self.tile, sep3, self.x, sep4, self.y,
+         self.spotGroup, self.readNum, endSep) = m.groups()
+        if self.readNum:
+            self.readNum = self.readNum[1:]
+        if self.spotGroup:
+            self.spotGroup = self.spotGroup[1:]
+
+        # Check for the presence of barcode corrections
+
+        m_bc = None
+        if ( self.deflineType == self.QIIME_ILLUMINA_OLD_BC or
+             not self.deflineType ):
+            m_bc = self.qiimeBc.match(self.deflineString)
+            if m_bc:
+                self.spotGroup = m_bc.group(2)
+            elif self.deflineType:
                 self.isValid = False
                 return self.isValid
 
-            # Get match values
-            
-            (self.qiimeName, self.prefix, sep1, self.lane, sep2, self.tile, sep3, self.x, sep4, self.y,
-             self.spotGroup, self.readNum, endSep) = m.groups()
-            if self.readNum:
-                self.readNum = self.readNum[1:]
-            if self.spotGroup:
-                self.spotGroup = self.spotGroup[1:]
-
-            # Check for the presence of barcode corrections
-
-            m_bc = None
-            if ( self.deflineType == self.QIIME_ILLUMINA_OLD_BC or
-                 ( not self.deflineType and
-                   self.qiimeBc.match(self.deflineString) ) ) :
-                m_bc = self.qiimeBc.match(self.deflineString)
-                if ( self.deflineType == self.QIIME_ILLUMINA_OLD_BC and
-                     m_bc is None ):
-                    self.isValid = False
-                    return self.isValid
-                else:
-                    self.spotGroup = m_bc.group(2)
+        # Set defline name
 
-            # Set defline name
+        self.name = "".join( ( self.prefix, sep1, self.lane, sep2, self.tile, sep3, self.x, sep4, self.y ) )
 
-            self.name = self.prefix + sep1 + self.lane + sep2 + self.tile + sep3 + self.x + sep4 + self.y
+        # Retain defline type if desired
 
-            # Retain defline type if desired
+        if ( not self.deflineType and
+             self.saveDeflineType ):
+            if m_bc is None:
+                self.deflineType = self.QIIME_ILLUMINA_OLD
+            else:
+                self.deflineType = self.QIIME_ILLUMINA_OLD_BC
+            self.platform = "ILLUMINA"
 
-            if ( not self.deflineType and
-                 self.saveDeflineType ):
-                if m_bc is None:
-                    self.deflineType = self.QIIME_ILLUMINA_OLD
-                else:
-                    self.deflineType = self.QIIME_ILLUMINA_OLD_BC
-                self.platform = "ILLUMINA"
+    ############################################################
+    # 454 defline
+    #
+    # @GG3IVWD03F5DLB length=97 xy=2404_1917 region=3 run=R_2010_05_11_11_15_22_ (XXX529889)
+    # @EV5T11R03G54ZJ (YYY307780)
+    # @GKW2OSF01D55D9 (ERR016499)
+    # @OS-230b_GLZVSPV04JTNWT (ERR039808)
+    # @HUT5UCF07H984F (SRR2035362)
+    # @EM7LVYS02FOYNU/1 (WWW000042 or WWW000043)
+    ############################################################
 
-        ############################################################
-        # 454 defline
-        #
-        # @GG3IVWD03F5DLB length=97 xy=2404_1917 region=3 run=R_2010_05_11_11_15_22_ (XXX529889)
-        # @EV5T11R03G54ZJ (YYY307780)
-        # @GKW2OSF01D55D9 (ERR016499)
-        # @OS-230b_GLZVSPV04JTNWT (ERR039808)
-        # @HUT5UCF07H984F (SRR2035362)
-        # @EM7LVYS02FOYNU/1 (WWW000042 or WWW000043)
-        ############################################################
+    def parseLs454(self, m=None):
 
-        elif ( self.deflineType == self.LS454 or
-               ( self.deflineType is None and
-                 self.ls454.match( self.deflineString ) ) ):
+        # Capture 454 values
+        
+        m = m or self.ls454.match( self.deflineString )
 
-            # Capture 454 values
-            
-            m = self.ls454.match( self.deflineString )
+        # Confirm regular expression succeeded
+        
+        if m is None :
+            self.isValid = False
+            return self.isValid
 
-            # Confirm regular expression succeeded
-            
-            if m is None :
-                self.isValid = False
-                return self.isValid
+        # Get match values
+        
+        (self.prefix,self.dateAndHash454,self.region454,self.xy454,self.readNum,endSep) = m.groups()
+        if self.readNum:
+            self.readNum = self.readNum[1:]
+        
+        # Set name
 
-            # Get match values
-            
-            (self.prefix,self.dateAndHash454,self.region454,self.xy454,self.readNum,endSep) = m.groups()
-            if self.readNum:
-                self.readNum = self.readNum[1:]
-            
-            # Set name
+        self.name = self.prefix + self.dateAndHash454 + self.region454 + self.xy454
 
-            self.name = self.prefix + self.dateAndHash454 + self.region454 + self.xy454
+        # Retain defline type if desired
 
-            # Retain defline type if desired
+        if ( not self.deflineType and
+             self.saveDeflineType ):
+            self.deflineType = self.LS454
+            self.platform = "LS454"
 
-            if ( not self.deflineType and
-                 self.saveDeflineType ):
-                self.deflineType = self.LS454
-                self.platform = "LS454"
+    ############################################################
+    # qiime with 454
+    #
+    # @T562_7000012 H29C5KU01AZBDB orig_bc=AGCTCACGTA new_bc=AGCTCACGTA bc_diffs=0 (WWW000018)
+    ############################################################
 
-        ############################################################
-        # qiime with 454
-        #
-        # @T562_7000012 H29C5KU01AZBDB orig_bc=AGCTCACGTA new_bc=AGCTCACGTA bc_diffs=0 (WWW000018)
-        ############################################################
+    def parseQiime454(self, m=None):
 
-        elif ( self.deflineType == self.QIIME_454 or
-               self.deflineType == self.QIIME_454_BC or
-               ( self.deflineType is None and
-                 self.qiime454.match( self.deflineString ) ) ):
+        # Capture 454 values
+        
+        m = m or self.qiime454.match( self.deflineString )
 
-            # Capture 454 values
-            
-            m = self.qiime454.match( self.deflineString )
+        # Confirm regular expression succeeded
+        
+        if m is None :
+            self.isValid = False
+            return self.isValid
 
-            # Confirm regular expression succeeded
-            
-            if m is None :
+        # Get match values
+        
+        (self.qiimeName,self.dateAndHash454,self.region454,self.xy454,self.readNum,endSep) = m.groups()
+        if self.readNum:
+            self.readNum = self.readNum[1:]
+
+        # Extract barcode if present
+        
+        m_bc = None
+        if ( self.deflineType == self.QIIME_454_BC or
+             not self.deflineType ):
+            m_bc = self.qiimeBc.match(self.deflineString)
+            if m_bc:
+                self.spotGroup = m_bc.group(2)
+            elif self.deflineType:
                 self.isValid = False
                 return self.isValid
 
-            # Get match values
-            
-            (self.qiimeName,self.dateAndHash454,self.region454,self.xy454,self.readNum,endSep) = m.groups()
-            if self.readNum:
-                self.readNum = self.readNum[1:]
-
-            # Extract barcode if present
-            
-            m_bc = None
-            if ( self.deflineType == self.QIIME_454_BC or
-                 ( not self.deflineType and
-                   self.qiimeBc.match(self.deflineString) ) ) :
-                m_bc = self.qiimeBc.match(self.deflineString)
-                if ( self.deflineType == self.QIIME_454_BC and
-                     m_bc is None ):
-                    self.isValid = False
-                    return self.isValid
-                else:
-                    self.spotGroup = m_bc.group(2)
-
-            # Set name
+        # Set name
 
-            self.name = self.dateAndHash454 + self.region454 + self.xy454
+        self.name = self.dateAndHash454 + self.region454 + self.xy454
 
-            # Retain defline type if desired
+        # Retain defline type if desired
 
-            if ( not self.deflineType and
-                 self.saveDeflineType ):
-                if m_bc is None:
-                    self.deflineType = self.QIIME_454
-                else:
-                    self.deflineType = self.QIIME_454_BC
-                self.platform = "LS454"
+        if ( not self.deflineType and
+             self.saveDeflineType ):
+            if m_bc is None:
+                self.deflineType = self.QIIME_454
+            else:
+                self.deflineType = self.QIIME_454_BC
+            self.platform = "LS454"
 
-        ############################################################
-        # Pacbio CCS/RoIs reads or subreads
-        #
-        # See https://www.biostars.org/p/146048/ for field descriptions
-        # Also see https://speakerdeck.com/pacbio/specifics-of-smrt-sequencing-data
-        # @m120525_202528_42132_c100323432550000001523017609061234_s1_p0/43 (XXX941211)
-        # @m101111_134728_richard_c000027022550000000115022502211150_s1_p0/1 (YYY075011)
-        # @m110115_082846_Uni_c000000000000000000000012706400001_s3_p0/1/0_508 (SRR497981)
-        # @m130727_043304_42150_c100538232550000001823086511101337_s1_p0/16/0_5273 (XXX989791)
-        # @m120328_022709_00128_c100311312550000001523011808061260_s1_p0/129/0_4701 (WWW000010)
-        # @m120204_011539_00128_c100220982555400000315052304111230_s2_p0/8/0_1446 (WWW000009)
-        ############################################################
+    ############################################################
+    # Pacbio CCS/RoIs reads or subreads
+    #
+    # See https://www.biostars.org/p/146048/ for field descriptions
+    # Also see https://speakerdeck.com/pacbio/specifics-of-smrt-sequencing-data
+    # @m120525_202528_42132_c100323432550000001523017609061234_s1_p0/43 (XXX941211)
+    # @m101111_134728_richard_c000027022550000000115022502211150_s1_p0/1 (YYY075011)
+    # @m110115_082846_Uni_c000000000000000000000012706400001_s3_p0/1/0_508 (SRR497981)
+    # @m130727_043304_42150_c100538232550000001823086511101337_s1_p0/16/0_5273 (XXX989791)
+    # @m120328_022709_00128_c100311312550000001523011808061260_s1_p0/129/0_4701 (WWW000010)
+    # @m120204_011539_00128_c100220982555400000315052304111230_s2_p0/8/0_1446 (WWW000009)
+    ############################################################
 
-        elif ( self.deflineType == self.PACBIO or
-               ( self.deflineType is None and
-                 self.pacbio.match ( self.deflineString ) ) ):
-            
-            # Capture name after '@' sign
+    def parsePacbio(self, m=None):
 
-            m = self.pacbio.match( self.deflineString )
+        # Capture name after '@' sign
 
-            # Confirm regular expression succeeded
-            
-            if m is None :
-                self.isValid = False
-                return self.isValid
+        m = m or self.pacbio.match( self.deflineString )
 
-            # Get match value
-            
-            self.name = m.group(1)
+        # Confirm regular expression succeeded
+        
+        if m is None :
+            self.isValid = False
+            return self.isValid
 
-            # Retain defline type if desired
+        # Get match value
+        
+        self.name = m.group(1)
 
-            if ( not self.deflineType and
-                 self.saveDeflineType ):
-                self.deflineType = self.PACBIO
-                self.platform = "PACBIO"
+        # Retain defline type if desired
 
-        ############################################################
-        # ion torrent
-        #
-        # @A313D:7:49 (XXX486160)
-        # @RD4FE:00027:00172 (XXX2925654)
-        # @ONBWR:00329:02356/1 (WWW000044)
-        # >311CX:3560:2667   length=347 (SRR547526)
-        ############################################################
+        if ( not self.deflineType and
+             self.saveDeflineType ):
+            self.deflineType = self.PACBIO
+            self.platform = "PACBIO"
 
-        elif ( self.deflineType == self.ION_TORRENT or
-               ( self.deflineType is None and
-                 self.ionTorrent.match ( self.deflineString ) ) ):
-            
-            # Capture name after '@' sign
+    ############################################################
+    # ion torrent
+    #
+    # @A313D:7:49 (XXX486160)
+    # @RD4FE:00027:00172 (XXX2925654)
+    # @ONBWR:00329:02356/1 (WWW000044)
+    # >311CX:3560:2667   length=347 (SRR547526)
+    ############################################################
 
-            m = self.ionTorrent.match( self.deflineString )
+    def parseIonTorrent(self, m=None):
 
-            # Confirm regular expression succeeded
-            
-            if m is None :
-                self.isValid = False
-                return self.isValid
+        # Capture name after '@' sign
 
-            # Get match values
-            
-            (self.runId, sep1, self.row, sep2, self.column, self.readNum, endSep) = m.groups()
+        m = m or self.ionTorrent.match( self.deflineString )
 
-            # Interpret readNum, if found
+        # Confirm regular expression succeeded
+        
+        if m is None :
+            self.isValid = False
+            return self.isValid
 
-            if self.readNum:
-                if ( self.readNum[0:1] == "/" or
-                     self.readNum[0:1] == "\\" ):
-                    self.readNum = self.readNum[1:]
-                elif self.readNum == "L":
-                    self.readNum = "1"
-                elif self.readNum == "R":
-                    self.readNum = "2"
+        # Get match values
+        
+        (self.runId, sep1, self.row, sep2, self.column, self.readNum, endSep) = m.groups()
 
-            # Set defline name
+        # Interpret readNum, if found
 
-            self.name = self.runId + sep1 + self.row + sep2 + self.column
+        if self.readNum:
+            if self.readNum.startswith( ( "/", "\\" ) ):
+                self.readNum = self.readNum[1:]
+            elif self.readNum == "L":
+                self.readNum = "1"
+            elif self.readNum == "R":
+                self.readNum = "2"
 
-            # Retain defline type if desired
+        # Set defline name
 
-            if ( not self.deflineType and
-                 self.saveDeflineType ):
-                self.deflineType = self.ION_TORRENT
-                self.platform = "ION_TORRENT"
+        self.name = "".join( ( self.runId, sep1, self.row, sep2, self.column ) )
 
-        ############################################################
-        # Old illumina bar code and/or read number only
-        # Must occur after pacbio defline check
-        #
-        # @_2_#GATCAGAT/1 (WWW000004)
-        # @Read_190546#BC005 length=1419 (XXX1616052)
-        # @SN971:2:1101:15.80:103.70#0/1 (WWW000034)
-        ############################################################
-        
-        elif ( self.deflineType == self.ILLUMINA_OLD_BC_RN or
-               ( self.deflineType is None and
-                 ( self.illuminaOldBcRnOnly.match ( self.deflineString ) or
-                   self.illuminaOldBcOnly.match ( self.deflineString ) or
-                   self.illuminaOldRnOnly.match ( self.deflineString ) ) ) ):
-            
-            if self.deflineType:
-                m = self.illuminaOldBcRn.match ( self.deflineString )
-            elif self.illuminaOldBcRnOnly.match ( self.deflineString ) :
-                m = self.illuminaOldBcRnOnly.match ( self.deflineString )
-                self.foundRE = self.illuminaOldBcRnOnly
-            elif self.illuminaOldBcOnly.match ( self.deflineString ):
-                m = self.illuminaOldBcOnly.match ( self.deflineString )
-                self.foundRE = self.illuminaOldBcOnly
-            else:
-                m = self.illuminaOldRnOnly.match ( self.deflineString )
-                self.foundRE = self.illuminaOldRnOnly
-                    
-            # Confirm regular expression succeeded
-            
-            if m is None :
-                self.isValid = False
-                return self.isValid
+        # Retain defline type if desired
 
-            # Assign values
+        if ( not self.deflineType and
+             self.saveDeflineType ):
+            self.deflineType = self.ION_TORRENT
+            self.platform = "ION_TORRENT"
 
-            (self.name, self.spotGroup, self.readNum, endSep) = m.groups()
-            if self.spotGroup[0:1] == "#":
-                self.spotGroup = self.spotGroup[1:]
-                if ( self.readNum[0:1] == "/" or
-                     self.readNum[0:1] == "\\" ):
-                    self.readNum = self.readNum[1:]
-                else:
-                    self.readNum = None
-            else:
-                self.readNum = self.spotGroup[1:]
-                self.spotGroup = None
+    ############################################################
+    # Old illumina bar code and/or read number only
+    # Must occur after pacbio defline check
+    #
+    # @_2_#GATCAGAT/1 (WWW000004)
+    # @Read_190546#BC005 length=1419 (XXX1616052)
+    # @SN971:2:1101:15.80:103.70#0/1 (WWW000034)
+    ############################################################
 
-            if self.spotGroup == "0":
-                self.spotGroup = None
+    def parseIlluminaOldBcRn(self, m=None):
 
-            # Save defline type and regular expression (must occur after determination of numDiscards)
+        # Detection passes in the match from whichever pattern succeeded
 
-            if ( not self.deflineType and
-                 self.saveDeflineType) :
-                self.illuminaOldBcRn = self.foundRE
-                self.deflineType = self.ILLUMINA_OLD_BC_RN
-                self.platform = "UNDEFINED"
+        if self.deflineType:
+            m = self.illuminaOldBcRn.match ( self.deflineString )
+        elif m:
+            self.foundRE = m.re
+                
+        # Confirm regular expression succeeded
+        
+        if m is None :
+            self.isValid = False
+            return self.isValid
 
-        ############################################################
-        # generic qiime
-        #
-        # @10317.000016458_0 orig_bc=TGCACCTCTGTC new_bc=TGCACCTCTGTC bc_diffs=0 (WWW000022)
-        ############################################################
+        # Assign values
 
-        elif ( self.deflineType == self.QIIME_GENERIC or
-               ( self.deflineType is None and
-                 self.qiimeBc.match( self.deflineString ) ) ):
+        (self.name, self.spotGroup, self.readNum, endSep) = m.groups()
+        if self.spotGroup.startswith("#"):
+            self.spotGroup = self.spotGroup[1:]
+            if self.readNum.startswith( ( "/", "\\" ) ):
+                self.readNum = self.readNum[1:]
+            else:
+                self.readNum = None
+        else:
+            self.readNum = self.spotGroup[1:]
+            self.spotGroup = None
 
-            # Capture generic qiime values
-            
-            m = self.qiimeBc.match( self.deflineString )
+        if self.spotGroup == "0":
+            self.spotGroup = None
 
-            # Confirm regular expression succeeded
-            
-            if m is None :
-                self.isValid = False
-                return self.isValid
+        # Save defline type and regular expression (must occur after determination of numDiscards)
 
-            # Get match values
-            
-            (self.name,self.spotGroup) = m.groups()
+        if ( not self.deflineType and
+             self.saveDeflineType) :
+            self.illuminaOldBcRn = self.foundRE
+            self.deflineType = self.ILLUMINA_OLD_BC_RN
+            self.platform = "UNDEFINED"
 
-            # Retain defline type if desired
+    ############################################################
+    # generic qiime
+    #
+    # @10317.000016458_0 orig_bc=TGCACCTCTGTC new_bc=TGCACCTCTGTC bc_diffs=0 (WWW000022)
+    ############################################################
 
-            if ( not self.deflineType and
-                 self.saveDeflineType ):
-                self.deflineType = self.QIIME_GENERIC
-                self.platform = "UNDEFINED"
+    def parseQiimeGeneric(self, m=None):
 
-        ############################################################
-        # Nanopore/MinION fastq
-        #
-        # @77_2_1650_1_ch100_file0_strand_twodirections (XXX2761339)
-        # @77_2_1650_1_ch100_file16_strand_twodirections:pass\77_2_1650_1_ch100_file16_strand.fast5 (SRR2761339)
-        # @channel_108_read_11_twodirections:flowcell_17/LomanLabz_PC_E.coli_MG1655_ONI_3058_1_ch108_file21_strand.fast5 (XXX637417 or YYY637417)
-        # @channel_108_read_11_complement:flowcell_17/LomanLabz_PC_E.coli_MG1655_ONI_3058_1_ch108_file21_strand.fast5 (XXX637417 or YYY637417)
-        # @channel_108_read_11_template:flowcell_17/LomanLabz_PC_E.coli_MG1655_ONI_3058_1_ch108_file21_strand.fast5 (XXX637417 or YYY637417)
-        # @channel_346_read_183-1D (SRR1747417)
-        # @channel_346_read_183-complement (SRR1747417)
-        # @channel_346_read_183-2D (SRR1747417)
-        # @ch120_file13-1D (SRR1980822)
-        # @ch120_file13-2D (SRR1980822)
-        # @channel_108_read_8:LomanLabz_PC_E.coli_MG1655_ONI_3058_1_ch108_file18_strand.fast5 (R-based poRe fastq requires filename, too) (WWW000025)
-        # @1dc51069-f61f-45db-b624-56c857c4e2a8_Basecall_2D_000_2d oxford_PC_HG02.3attempt_0633_1_ch96_file81_strand_twodirections:CORNELL_Oxford_Nanopore/oxford_PC_HG02.3attempt_0633_1_ch96_file81_strand.fast5 (SRR2848544 - self.nanopore3)
-        # @ae74c4fb-2c1d-4176-9584-3dfcc6dce41e_Basecall_2D_2d UT317077_20160808_FNFAD22478_MN19846_sequencing_run_FHV_Barcoded_TakeII_88358_ch93_read2620_strand NB06\UT317077_20160808_FNFAD22478_MN19846_sequencing_run_FHV_Barcoded_TakeII_88358_ch93_read2620_strand.fast5 (SRR5085901 - self.nanopore3)
-        # @ddb7d987-73c0-4d9a-8ac0-ac0dbc462ab5_Basecall_2D_2d UT317077_20160808_FNFAD22478_MN19846_sequencing_run_FHV_Barcoded_TakeII_88358_ch100_read4767_strand1 NB06\UT317077_20160808_FNFAD22478_MN19846_sequencing_run_FHV_Barcoded_TakeII_88358_ch100_read4767_strand1.fast5 (SRR5085901 - self.nanopore3)
-        # @channel_101_read_1.1C|1T|2D (ERR1121618 bam converted to fastq)
-        ############################################################
+        # Capture generic qiime values
+        
+        m = m or self.qiimeBc.match( self.deflineString )
 
-        elif ( self.deflineType == self.NANOPORE or
-               ( self.deflineType is None and
-                 ( self.nanopore.match( self.deflineString ) or
-                   self.nanopore2.match( self.deflineString ) or
-                   self.nanopore3.match( self.deflineString ) ) ) ) :
+        # Confirm regular expression succeeded
         
-            if self.deflineType:
-                m = self.nanopore.match ( self.deflineString )
-
-            elif self.nanopore.match ( self.deflineString ) :
-                m = self.nanopore.match ( self.deflineString )
-                self.foundRE = self.nanopore
-            elif self.nanopore2.match ( self.deflineString ) :
-                m = self.nanopore2.match ( self.deflineString )
-                self.foundRE = self.nanopore2
-            else:
-                m = self.nanopore3.match ( self.deflineString )
-                self.foundRE = self.nanopore3
+        if m is None :
+            self.isValid = False
+            return self.isValid
 
-            # Confirm regular expression succeeded
-            
-            if m is None :
-                self.isValid = False
-                return self.isValid
+        # Get match values
+        
+        (self.name,self.spotGroup) = m.groups()
+
+        # Retain defline type if desired
+
+        if ( not self.deflineType and
+             self.saveDeflineType ):
+            self.deflineType = self.QIIME_GENERIC
+            self.platform = "UNDEFINED"
+
+    ############################################################
+    # Nanopore/MinION fastq
+    #
+    # @77_2_1650_1_ch100_file0_strand_twodirections (XXX2761339)
+    # @77_2_1650_1_ch100_file16_strand_twodirections:pass\77_2_1650_1_ch100_file16_strand.fast5 (SRR2761339)
+    # @channel_108_read_11_twodirections:flowcell_17/LomanLabz_PC_E.coli_MG1655_ONI_3058_1_ch108_file21_strand.fast5 (XXX637417 or YYY637417)
+    # @channel_108_read_11_complement:flowcell_17/LomanLabz_PC_E.coli_MG1655_ONI_3058_1_ch108_file21_strand.fast5 (XXX637417 or YYY637417)
+    # @channel_108_read_11_template:flowcell_17/LomanLabz_PC_E.coli_MG1655_ONI_3058_1_ch108_file21_strand.fast5 (XXX637417 or YYY637417)
+    # @channel_346_read_183-1D (SRR1747417)
+    # @channel_346_read_183-complement (SRR1747417)
+    # @channel_346_read_183-2D (SRR1747417)
+    # @ch120_file13-1D (SRR1980822)
+    # @ch120_file13-2D (SRR1980822)
+    # @channel_108_read_8:LomanLabz_PC_E.coli_MG1655_ONI_3058_1_ch108_file18_strand.fast5 (R-based poRe fastq requires filename, too) (WWW000025)
+    # @1dc51069-f61f-45db-b624-56c857c4e2a8_Basecall_2D_000_2d oxford_PC_HG02.3attempt_0633_1_ch96_file81_strand_twodirections:CORNELL_Oxford_Nanopore/oxford_PC_HG02.3attempt_0633_1_ch96_file81_strand.fast5 (SRR2848544 - self.nanopore3)
+    # @ae74c4fb-2c1d-4176-9584-3dfcc6dce41e_Basecall_2D_2d UT317077_20160808_FNFAD22478_MN19846_sequencing_run_FHV_Barcoded_TakeII_88358_ch93_read2620_strand NB06\UT317077_20160808_FNFAD22478_MN19846_sequencing_run_FHV_Barcoded_TakeII_88358_ch93_read2620_strand.fast5 (SRR5085901 - self.nanopore3)
+    # @ddb7d987-73c0-4d9a-8ac0-ac0dbc462ab5_Basecall_2D_2d UT317077_20160808_FNFAD22478_MN19846_sequencing_run_FHV_Barcoded_TakeII_88358_ch100_read4767_strand1 NB06\UT317077_20160808_FNFAD22478_MN19846_sequencing_run_FHV_Barcoded_TakeII_88358_ch100_read4767_strand1.fast5 (SRR5085901 - self.nanopore3)
+    # @channel_101_read_1.1C|1T|2D (ERR1121618 bam converted to fastq)
+    ############################################################
+
+    def parseNanopore(self, m=None):
+
+        # Detection passes in the match from whichever nanopore
+        # pattern succeeded
+
+        if self.deflineType:
+            m = self.nanopore.match ( self.deflineString )
+        elif m:
+            self.foundRE = m.re
+
+        # Confirm regular expression succeeded
+        
+        if m is None :
+            self.isValid = False
+            return self.isValid
 
-            # Assign values (note that readNum may actually be a file number which is not the same)
+        # Assign values (note that readNum may actually be a file number which is not the same)
 
-            poreMid = None
-            if ( self.nanopore == self.nanopore3 or
-                 self.foundRE == self.nanopore3 ):
-                ( self.name, self.poreRead, discard, poreStart, self.channel, poreMid, self.readNo, poreEnd, endSep ) = m.groups()
-                self.poreFile = poreStart + self.channel + poreMid + self.readNo + poreEnd
-            else:
-                ( poreStart, self.channel, poreMid, self.readNo, poreEnd, self.poreRead, self.poreFile, endSep ) = m.groups()
-                self.name = poreStart + self.channel + poreMid + self.readNo + poreEnd
+        poreMid = None
+        if ( self.nanopore == self.nanopore3 or
+             self.foundRE == self.nanopore3 ):
+            ( self.name, self.poreRead, discard, poreStart, self.channel, poreMid, self.readNo, poreEnd, endSep ) = m.groups()
+            self.poreFile = "".join( ( poreStart, self.channel, poreMid, self.readNo, poreEnd ) )
+        else:
+            ( poreStart, self.channel, poreMid, self.readNo, poreEnd, self.poreRead, self.poreFile, endSep ) = m.groups()
+            self.name = "".join( ( poreStart, self.channel, poreMid, self.readNo, poreEnd ) )
 
-            # Set readNum to None if actually a file number
+        # Set readNum to None if actually a file number
 
-            if ( poreMid and
-                 poreMid == "_file" ):
-                self.readNo = 0
+        if ( poreMid and
+             poreMid == "_file" ):
+            self.readNo = 0
 
-            # Process poreFile if present
+        # Process poreFile if present
 
-            if self.poreFile:
+        if self.poreFile:
 
-                # Check for 'pass' or 'fail'
+            # Check for 'pass' or 'fail'
 
-                if re.search( "pass(/|\\\\)", self.poreFile ):
-                    self.filterRead = 0
-                elif re.search( "fail(/|\\\\)", self.poreFile ):
-                    self.filterRead = 1
+            if ( "pass/" in self.poreFile or
+                 "pass\\" in self.poreFile ):
+                self.filterRead = 0
+            elif ( "fail/" in self.poreFile or
+                   "fail\\" in self.poreFile ):
+                self.filterRead = 1
 
-                # Check for barcode
+            # Check for barcode
 
-                b = re.search ( "(NB\d{2}|BC\d{2})(/|\\\\)", self.poreFile )
-                if b:
-                    (self.spotGroup,delimiter) = b.groups()
-                
-                # Split poreFile on '/' or '\' if present
-
-                poreFileChunks = re.split('/|\\\\',self.poreFile)
-                if len ( poreFileChunks) > 1:
-                    self.poreFile = poreFileChunks.pop()
-
-            # Check for missing poreRead (from R-based poRe fastq dump) and normalize read type
-
-            if not self.poreRead:
-                if self.filename:
-                    if re.search( re.escape(".2D."), self.filename):
-                        self.poreRead = "2D"
-                    elif re.search( re.escape(".template."), self.filename):
-                        self.poreRead = "template"
-                    elif re.search( re.escape(".complement."), self.filename):
-                        self.poreRead = "complement"
-                    else:
-                        self.statusWriter.outputErrorAndExit( "Unable to determine nanopore read type ... {}".format(self.deflineString) )
+            b = self.nanoporeBarcode.search ( self.poreFile )
+            if b:
+                (self.spotGroup,delimiter) = b.groups()
+            
+            # Split poreFile on '/' or '\' if present
+
+            poreFileChunks = self.poreFile.replace('\\','/').split('/')
+            if len ( poreFileChunks) > 1:
+                self.poreFile = poreFileChunks.pop()
+
+        # Check for missing poreRead (from R-based poRe fastq dump) and normalize read type
+
+        if not self.poreRead:
+            if self.filename:
+                if ".2D." in self.filename:
+                    self.poreRead = "2D"
+                elif ".template." in self.filename:
+                    self.poreRead = "template"
+                elif ".complement." in self.filename:
+                    self.poreRead = "complement"
                 else:
                     self.statusWriter.outputErrorAndExit( "Unable to determine nanopore read type ... {}".format(self.deflineString) )
-            elif ( self.poreRead == "_twodirections" or
-                   self.poreRead[1:] == "2D" or
-                   self.poreRead == "_2d" ):
-                self.poreRead = "2D"
-            elif ( self.poreRead == "_template" or
-                   self.poreRead == "-1D" or
-                   self.poreRead == ".1T" ):
-                self.poreRead = "template"
             else:
-                self.poreRead = "complement"
-
-            if ( not self.deflineType and
-                 self.saveDeflineType ):
-                self.deflineType = self.NANOPORE
-                self.nanopore = self.foundRE
-                self.platform = "NANOPORE"
-
-        ############################################################
-        # read_id and barcode
-        #
-        # @12-Dfasci_84178 read_id=12-Dfasci::G2J4TZQ02D3VUU barcode=AAAAAATT (WWW000023)
-        # @32_L3_60077 read_id=24_PPC4::HDOFHVG03GOW52 barcode=AAAAAACT (WWW000023)
-        # @PF01_76 read_id=P2034:00008:00038 barcode=CTATACACT (SRR2420289)
-        ############################################################
-
-        elif ( self.deflineType == self.READID_BARCODE or
-               ( self.deflineType is None and
-                 self.readIdBarcode.match( self.deflineString ) ) ) :
-            
-            # Capture 'qiimeName', prefix, read_id, and barcode
-            
-            m = self.readIdBarcode.match ( self.deflineString )
+                self.statusWriter.outputErrorAndExit( "Unable to determine nanopore read type ... {}".format(self.deflineString) )
+        else:
+            self.poreRead = self.nanoporeReadTypes.get( self.poreRead, "complement" )
 
-            # Confirm regular expression succeeded
-            
-            if m is None:
-                self.isValid = False
-                return self.isValid
+        if ( not self.deflineType and
+             self.saveDeflineType ):
+            self.deflineType = self.NANOPORE
+            self.nanopore = self.foundRE
+            self.platform = "NANOPORE"
 
-            # Get match values
-            
-            (self.qiimeName,self.prefix,self.name,self.spotGroup,endSep) = m.groups()
-            
-            # Prepend self.prefix onto self.name if it exists and not at start of self.qiimeName
-            
-            if ( self.prefix and
-                 not re.search( re.escape(self.prefix[0:len(self.prefix)-2]), self.qiimeName ) ):
-                self.name = self.prefix + self.name
+    ############################################################
+    # read_id and barcode
+    #
+    # @12-Dfasci_84178 read_id=12-Dfasci::G2J4TZQ02D3VUU barcode=AAAAAATT (WWW000023)
+    # @32_L3_60077 read_id=24_PPC4::HDOFHVG03GOW52 barcode=AAAAAACT (WWW000023)
+    # @PF01_76 read_id=P2034:00008:00038 barcode=CTATACACT (SRR2420289)
+    ############################################################
 
-            # Retain defline type if desired
+    def parseReadIdBarcode(self, m=None):
 
-            if ( not self.deflineType and
-                 self.saveDeflineType ):
-                self.deflineType = self.READID_BARCODE
-                self.platform = "UNDEFINED"
+        # Capture 'qiimeName', prefix, read_id, and barcode
+        
+        m = m or self.readIdBarcode.match ( self.deflineString )
 
-        ############################################################
-        # Capillary/Sanger fastq with template & dir for input to newbler
-        # Template is used for read/spot name; first name is discarded
-        #
-        # @Msex-P09-F_A01 template=Msex-P09-A01 dir=fwd library=BAC_end (SRR2762665)
-        # @Msex-P09-R_A01 template=Msex-P09-A01 dir=rev library=BAC_end
-        # >bac-190o01.f template=190o01 dir=f library=BACends (from https://contig.wordpress.com/2011/01/21/newbler-input-ii-sequencing-reads-from-other-platforms)
-        # >bac-190o01.r template=190o01 dir=r library=BACends
-        # >originalreadname_1 template=originalreadname dir=F library=somename (from https://contig.wordpress.com/2010/06/10/running-newbler-de-novo-assembly/
-        # >originalreadname_2 template=originalreadname dir=R library=somename
-        # >DJS045A03F template=DJS054A03 dir=F library=DJS045 trim=12-543 (from http://454.com/downloads/my454/documentation/gs-flx-plus/454SeqSys_SWManual-v2.6_PartC_May2011.pdf)
-        ############################################################
+        # Confirm regular expression succeeded
+        
+        if m is None:
+            self.isValid = False
+            return self.isValid
 
-        elif ( self.deflineType == self.SANGER_NEWBLER or
-               ( self.deflineType is None and
-                 self.sangerNewbler.match ( self.deflineString ) ) ) :
+        # Get match values
+        
+        (self.qiimeName,self.prefix,self.name,self.spotGroup,endSep) = m.groups()
+        
+        # Prepend self.prefix onto self.name if it exists and not at start of self.qiimeName
+        
+        if ( self.prefix and
+             not self.prefix[0:len(self.prefix)-2] in self.qiimeName ):
+            self.name = self.prefix + self.name
 
-            # Capture 'qiimeName', prefix, read_id, and barcode
-            
-            m = self.sangerNewbler.match( self.deflineString )
+        # Retain defline type if desired
 
-            # Confirm regular expression succeeded
-            
-            if m is None :
-                self.isValid = False
-                return self.isValid
+        if ( not self.deflineType and
+             self.saveDeflineType ):
+            self.deflineType = self.READID_BARCODE
+            self.platform = "UNDEFINED"
 
-            # Get match values (template becomes the name)
-            
-            (localName,self.name,self.dir,endSep) = m.groups()
+    ############################################################
+    # Capillary/Sanger fastq with template & dir for input to newbler
+    # Template is used for read/spot name; first name is discarded
+    #
+    # @Msex-P09-F_A01 template=Msex-P09-A01 dir=fwd library=BAC_end (SRR2762665)
+    # @Msex-P09-R_A01 template=Msex-P09-A01 dir=rev library=BAC_end
+    # >bac-190o01.f template=190o01 dir=f library=BACends (from https://contig.wordpress.com/2011/01/21/newbler-input-ii-sequencing-reads-from-other-platforms)
+    # >bac-190o01.r template=190o01 dir=r library=BACends
+    # >originalreadname_1 template=originalreadname dir=F library=somename (from https://contig.wordpress.com/2010/06/10/running-newbler-de-novo-assembly/
+    # >originalreadname_2 template=originalreadname dir=R library=somename
+    # >DJS045A03F template=DJS054A03 dir=F library=DJS045 trim=12-543 (from http://454.com/downloads/my454/documentation/gs-flx-plus/454SeqSys_SWManual-v2.6_PartC_May2011.pdf)
+    ############################################################
 
-            # Set readNum (expected to be char)
+    def parseSangerNewbler(self, m=None):
 
-            if self.dir[0] in ('f', 'F'):
-                self.readNum = '1'
-            elif self.dir[0] in ('r', 'R'):
-                self.readNum = '2'
-            else:
-                self.statusWriter.outputErrorAndExit( "Unexpected sanger read dir value ... {}".format(self.deflineString) )
+        # Capture 'qiimeName', prefix, read_id, and barcode
+        
+        m = m or self.sangerNewbler.match( self.deflineString )
 
-            # Retain defline type if desired
+        # Confirm regular expression succeeded
+        
+        if m is None :
+            self.isValid = False
+            return self.isValid
 
-            if ( not self.deflineType and
-                 self.saveDeflineType ):
-                self.deflineType = self.SANGER_NEWBLER
-                self.platform = "CAPILLARY"
+        # Get match values (template becomes the name)
+        
+        (localName,self.name,self.dir,endSep) = m.groups()
 
-        ############################################################
-        # Default just use non-whitespace characters after > or @
-        # 
-        # @MB03~zSEQ034LingCncrtPool1~0000282 (SRR869399)
-        # @Lab1.3.ab1 1249 10 1068 (WWW000012)
-        # @CH_BAC1_C05.ab1_extraction_2 (WWW000011)
-        # @G15-D_3_1_903_603_0.81 (XXX006565)
-        # >No_name^M (WWW000021)
-        # @SN7001204_0288_BH97LHADXX_R_SRi_L5503_L5508:11106:1433:74165 (WWW000035)
-        # @HWI-ST170:292:8:1101:1239-2176 (WWW000036)
-        # @Read_1-Barcode=BC001-PIPELINE=V41 length=6487 (WWW000038)
-        # @contig_2_to_3_R_inner_clone_1_9589_A11_BJ-674528_048.ab1 (SRR2064214)
-        # @S3_332 (ERR1288564)
-        # @sim_CFSAN001140-756880/1 (SRR3020730)
-        ############################################################
+        # Set readNum (expected to be char)
 
-        elif ( self.deflineType == self.UNDEFINED or
-               ( self.deflineType is None and
-                 self.undefined.match ( self.deflineString ) ) ):
+        self.readNum = self.sangerReadNums.get( self.dir[0] )
+        if not self.readNum:
+            self.statusWriter.outputErrorAndExit( "Unexpected sanger read dir value ... {}".format(self.deflineString) )
 
-            # Capture name after '@' sign
+        # Retain defline type if desired
 
-            m = self.undefined.match( self.deflineString )
+        if ( not self.deflineType and
+             self.saveDeflineType ):
+            self.deflineType = self.SANGER_NEWBLER
+            self.platform = "CAPILLARY"
 
-            # Confirm regular expression succeeded
-            
-            if m is None :
-                self.isValid = False
-                return self.isValid
+    ############################################################
+    # Default just use non-whitespace characters after > or @
+    # 
+    # @MB03~zSEQ034LingCncrtPool1~0000282 (SRR869399)
+    # @Lab1.3.ab1 1249 10 1068 (WWW000012)
+    # @CH_BAC1_C05.ab1_extraction_2 (WWW000011)
+    # @G15-D_3_1_903_603_0.81 (XXX006565)
+    # >No_name^M (WWW000021)
+    # @SN7001204_0288_BH97LHADXX_R_SRi_L5503_L5508:11106:1433:74165 (WWW000035)
+    # @HWI-ST170:292:8:1101:1239-2176 (WWW000036)
+    # @Read_1-Barcode=BC001-PIPELINE=V41 length=6487 (WWW000038)
+    # @contig_2_to_3_R_inner_clone_1_9589_A11_BJ-674528_048.ab1 (SRR2064214)
+    # @S3_332 (ERR1288564)
+    # @sim_CFSAN001140-756880/1 (SRR3020730)
+    ############################################################
 
-            # Get match value
-            
-            self.name = m.group(1)
+    def parseUndefined(self, m=None):
 
-            # Retain defline type if desired
+        # Capture name after '@' sign
 
-            if ( not self.deflineType and
-                 self.saveDeflineType ):
-                self.deflineType = self.UNDEFINED
-                self.platform = "UNDEFINED"
+        m = m or self.undefined.match( self.deflineString )
 
-        else:
+        # Confirm regular expression succeeded
+        
+        if m is None :
             self.isValid = False
+            return self.isValid
 
-        if ( self.isValid and
-             self.ignLeadCharsNum ):
-            self.ignoredLeadChars = self.name[0:self.ignLeadCharsNum]
-            self.name = self.name[self.ignLeadCharsNum:]
-
-        return self.isValid
-
-        # SRA fastq output with read numbers
-        # SRA fastq output without read numbers
+        # Get match value
+        
+        self.name = m.group(1)
+
+        # Retain defline type if desired
+
+        if ( not self.deflineType and
+             self.saveDeflineType ):
+            self.deflineType = self.UNDEFINED
+            self.platform = "UNDEFINED"
+
+    ############################################################
+    # Parser for each (retained) defline type
+    ############################################################
+
+    deflineParsers = { HELICOS                   : parseHelicos,
+                       ABSOLID                   : parseAbSolid,
+                       ILLUMINA_NEW              : parseIlluminaNew,
+                       ILLUMINA_NEW_DOUBLE       : parseIlluminaNew,
+                       ILLUMINA_NEW_OLD          : parseIlluminaNew,
+                       ILLUMINA_OLD              : parseIlluminaOld,
+                       QIIME_ILLUMINA_NEW        : parseQiimeIlluminaNew,
+                       QIIME_ILLUMINA_NEW_BC     : parseQiimeIlluminaNew,
+                       QIIME_ILLUMINA_NEW_DBL    : parseQiimeIlluminaNew,
+                       QIIME_ILLUMINA_NEW_DBL_BC : parseQiimeIlluminaNew,
+                       QIIME_ILLUMINA_OLD        : parseQiimeIlluminaOld,
+                       QIIME_ILLUMINA_OLD_BC     : parseQiimeIlluminaOld,
+                       LS454                     : parseLs454,
+                       QIIME_454                 : parseQiime454,
+                       QIIME_454_BC              : parseQiime454,
+                       PACBIO                    : parsePacbio,
+                       ION_TORRENT               : parseIonTorrent,
+                       ILLUMINA_OLD_BC_RN        : parseIlluminaOldBcRn,
+                       QIIME_GENERIC             : parseQiimeGeneric,
+                       NANOPORE                  : parseNanopore,
+                       READID_BARCODE            : parseReadIdBarcode,
+                       SANGER_NEWBLER            : parseSangerNewbler,
+                       UNDEFINED                 : parseUndefined }
 
     ############################################################
     # Count extra numbers in Illumina prefix (at most 2)
@@ -1703,7 +1773,7 @@ class Defline:
         # Determine how many numbers at the end of self.prefix
         # separated by colons
 
-        prefixChunks = re.split(sep,self.prefix)
+        prefixChunks = self.prefix.split(sep)
         prefixChunksLen = len(prefixChunks)
         numCount = 0
 
@@ -1735,6 +1805,17 @@ class Defline:
 
 class Seq:
     """ Parses/validates sequence string """
+
+    # Lowercase (soft-clipped) bases at either end of the sequence
+
+    CLIP_CHARS = "actgn."
+
+    # Sequence alphabets. A sequence is valid if nothing is left after
+    # deleting these from its ASCII encoding.
+
+    BASE_CHARS_DOT = b"ACTGNWSBVDHKMRY."
+    BASE_CHARS = b"ACTGNWSBVDHKMRY"
+    COLOR_CHARS = b"0123."
     
     def __init__(self, seqString):
         self.seqOrig = None
@@ -1746,10 +1827,6 @@ class Seq:
         self.clipLeft = 0
         self.clipRight = 0
         self.csKey = None
-        if (sys.version).startswith("3"):
-            self.transBase1 = str.maketrans('', '', "ACTGNWSBVDHKMRY.")
-            self.transBase2 = str.maketrans('', '', "ACTGNWSBVDHKMRY")
-            self.transColor = str.maketrans('', '', "0123.")
         if seqString:
             self.parseSeq(seqString)
 
@@ -1762,9 +1839,7 @@ class Seq:
         if seqOrig[0] == seq[0]:
             return 0
         else:
-            m = re.search ( "^([actgn.]*)", seqOrig )
-            clipString = m.group(0)
-            return len(clipString)
+            return len(seqOrig) - len(seqOrig.lstrip(cls.CLIP_CHARS))
             
     ############################################################
     # Determine number of bases to clip from right of sequence
@@ -1776,41 +1851,39 @@ class Seq:
         if seqOrig[seqLen-1] == seq[seqLen-1]:
             return 0
         else:
-            m = re.search ( "([actgn.]*)$", seqOrig )
-            clipString = m.group(0)
-            return len(clipString)
+            return len(seqOrig) - len(seqOrig.rstrip(cls.CLIP_CHARS))
             
     ############################################################
     # Determine if provided seqString matches only sequence characters
+    # (seqUpper can be passed if the caller already has the stripped,
+    # uppercased sequence)
     ############################################################
     
-    def parseSeq ( self, seqString ):
+    def parseSeq ( self, seqString, seqUpper=None ):
         self.seqOrig = seqString.strip()
-        self.seq = self.seqOrig.upper()
+        self.seq = seqUpper if seqUpper is not None else self.seqOrig.upper()
         self.length = len(self.seq)
         self.isValid = False
         self.clipLeft = 0
         self.clipRight = 0
         self.csKey = None
 
+        # Non-ASCII characters become '?' and so are never valid
+
+        seqBytes = self.seq.encode('ascii', 'replace')
+
         if self.length == 0:
             pass
 
         elif self.isBaseSpace:
-            if (sys.version).startswith("3"):
-                empty = self.seq.translate(self.transBase1)
-            else:
-                empty = self.seq.translate(None, "ACTGNWSBVDHKMRY.")
+            empty = seqBytes.translate(None, self.BASE_CHARS_DOT)
             if len(empty) == 0:
                 self.isValid = True
                 self.clipLeft = Seq.getClipLeft(self.seqOrig,self.seq)
                 self.clipRight = Seq.getClipRight(self.seqOrig,self.seq)
 
         elif self.isColorSpace:
-            if (sys.version).startswith("3"):
-                empty2 = self.seq[1:].translate(self.transColor)
-            else:
-                empty2 = self.seq[1:].translate(None, "0123.")
+            empty2 = seqBytes[1:].translate(None, self.COLOR_CHARS)
             if ( len(empty2) == 0 and
                  self.seq[0:1] in "ACTG" ):
                 self.isValid = True
@@ -1820,10 +1893,7 @@ class Seq:
                 self.length -= 1
                 
         else:
-            if (sys.version).startswith("3"):
-                empty = self.seq.translate(self.transBase2)
-            else:
-                empty = self.seq.translate(None, "ACTGNWSBVDHKMRY")
+            empty = seqBytes.translate(None, self.BASE_CHARS)
             if len(empty) == 0:
                 self.isValid = True
                 self.isBaseSpace = True
@@ -1831,10 +1901,7 @@ class Seq:
                 self.clipRight = Seq.getClipRight(self.seqOrig,self.seq)
         
             else:
-                if (sys.version).startswith("3"):
-                    empty2 = self.seq[1:].translate(self.transColor)
-                else:
-                    empty2 = self.seq[1:].translate(None, "0123.")
+                empty2 = seqBytes[1:].translate(None, self.COLOR_CHARS)
                 if ( len(empty2) == 0 and
                      self.seq[0:1] in "ACTG" ):
                     self.isValid = True
@@ -1848,10 +1915,7 @@ class Seq:
                     # Check for non-colorspace seq with dots
                     # (2nd check here to properly handle colorspace seq consisting of all dots)
 
-                    if (sys.version).startswith("3"):
-                        empty3 = self.seq.translate(self.transBase1)
-                    else:
-                        empty3 = self.seq.translate(None, "ACTGNWSBVDHKMRY.")
+                    empty3 = seqBytes.translate(None, self.BASE_CHARS_DOT)
                     if len(empty3) == 0:
                         self.isValid = True
                         self.isBaseSpace = True
@@ -1917,10 +1981,11 @@ class Qual:
                  singleIntQual ) ) ):
             for qualSubString in self.qual.split():
                 if self.isInt(qualSubString):
-                    if int(qualSubString) < self.minQual:
-                        self.minQual = int(qualSubString)
-                    if int(qualSubString) > self.maxQual:
-                        self.maxQual = int(qualSubString)
+                    qualValue = int(qualSubString)
+                    if qualValue < self.minQual:
+                        self.minQual = qualValue
+                    if qualValue > self.maxQual:
+                        self.maxQual = qualValue
                     self.length += 1
                     if self.maxQual > 100:
                         sys.exit( "Numerical quality is too high  ... {}".format(self.qual) )
@@ -1938,12 +2003,12 @@ class Qual:
         # Subsequent processing will be used better establish the offset
 
         else:
-            for c in self.qual:
-                o = ord(c)
-                if o < self.minOrd:
-                    self.minOrd = o
-                if o > self.maxOrd:
-                    self.maxOrd = o
+            # Scan the string once in C via set(); min/max then only
+            # look at the (small) set of distinct quality characters
+
+            qualChars = set(self.qual)
+            self.minOrd = ord( min(qualChars) )
+            self.maxOrd = ord( max(qualChars) )
 
             if self.maxOrd <= 126: # no special characters present
                 self.length = len(self.qual)
@@ -1960,14 +2025,142 @@ class Qual:
 
     @staticmethod
     def isInt ( qStr ):
-        if qStr[0] in ('-', '+'):
-            if len(qStr) > 1:
-                return qStr[1:].isdigit()
-            else:
-                return False
-        else:
-            return qStr.isdigit()
+        return ( qStr.isdigit() or
+                 ( qStr[0:1] in ('-', '+') and
+                   qStr[1:].isdigit() ) )
     
+############################################################
+# DecompressReader Class
+############################################################
+
+class DecompressReader (io.RawIOBase):
+    """ Seekable raw stream fed by a background decompression thread.
+        Owns rawHandle (the compressed file) and closes it on close() """
+
+    chunkSize = 1048576 # decompressed bytes handed over per queue entry
+    queueDepth = 2
+
+    def __init__(self, openDecompressor, rawHandle):
+        io.RawIOBase.__init__(self)
+        self.openDecompressor = openDecompressor
+        self.rawHandle = rawHandle
+        self.thread = None
+        self.startThread()
+
+    ############################################################
+    # Start decompressing from the beginning of the file.
+    # Queue and stop event are passed to the thread so that a
+    # stopped thread never touches its replacement's state.
+    ############################################################
+
+    def startThread (self):
+        self.pos = 0
+        self.chunk = memoryview(b'')
+        self.chunkPos = 0
+        self.atEof = False
+        self.chunks = queue.Queue(self.queueDepth)
+        self.stopEvent = threading.Event()
+        self.thread = threading.Thread( target=self.decompress,
+                                        args=(self.chunks, self.stopEvent),
+                                        daemon=True )
+        self.thread.start()
+
+    ############################################################
+    # Stop decompression thread (draining queue so it can exit)
+    ############################################################
+
+    def stopThread (self):
+        if self.thread:
+            self.stopEvent.set()
+            while self.thread.is_alive():
+                try:
+                    self.chunks.get_nowait()
+                except queue.Empty:
+                    self.thread.join(0.01)
+            self.thread = None
+
+    ############################################################
+    # Decompression thread body. An empty chunk marks eof and
+    # exceptions are passed through the queue to the reader.
+    ############################################################
+
+    def decompress (self, chunks, stopEvent):
+        try:
+            with self.openDecompressor() as handle:
+                while not stopEvent.is_set():
+                    chunk = handle.read(self.chunkSize)
+                    chunks.put(chunk)
+                    if not chunk:
+                        break
+        except Exception as e:
+            if not stopEvent.is_set():
+                chunks.put(e)
+
+    ############################################################
+    # Make next decompressed chunk current (False at eof)
+    ############################################################
+
+    def nextChunk (self):
+        if self.atEof:
+            return False
+        chunk = self.chunks.get()
+        if isinstance(chunk, Exception):
+            self.atEof = True
+            raise chunk
+        elif not chunk:
+            self.atEof = True
+            return False
+        self.chunk = memoryview(chunk)
+        self.chunkPos = 0
+        return True
+
+    ############################################################
+    # io.RawIOBase interface
+    ############################################################
+
+    def readable (self):
+        return True
+
+    def seekable (self):
+        return True
+
+    def tell (self):
+        return self.pos
+
+    def readinto (self, buffer):
+        if ( self.chunkPos == len(self.chunk) and
+             not self.nextChunk() ):
+            return 0
+        count = min( len(buffer), len(self.chunk) - self.chunkPos )
+        buffer[0:count] = self.chunk[self.chunkPos:self.chunkPos+count]
+        self.chunkPos += count
+        self.pos += count
+        return count
+
+    # Seeking backwards restarts decompression (as GzipFile does)
+
+    def seek (self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.pos
+        elif whence != io.SEEK_SET:
+            raise io.UnsupportedOperation("Unable to seek relative to end of decompressed stream")
+        if offset < self.pos:
+            self.stopThread()
+            self.startThread()
+        while self.pos < offset:
+            if ( self.chunkPos == len(self.chunk) and
+                 not self.nextChunk() ):
+                break
+            count = min( offset - self.pos, len(self.chunk) - self.chunkPos )
+            self.chunkPos += count
+            self.pos += count
+        return self.pos
+
+    def close (self):
+        self.stopThread()
+        self.rawHandle.close()
+        io.RawIOBase.close(self)
+
 ############################################################
 # FastqReader Class
 ############################################################
@@ -1975,6 +2168,8 @@ class Qual:
 class FastqReader:
     """ Retains information read/parsed from fastq file """
 
+    abiTitleRE = re.compile("# Title: ([!-~]+)") # ABI header line carrying the title
+
     def __init__(self,filename,handle):
         handle.seek(0)
         self.filename = filename
@@ -2019,7 +2214,7 @@ class FastqReader:
         self.outputStatus = False
         self.statusWriter = None
         self.headerLineCount = self.processHeader(handle,self.defline)
-        self.deflineCheck = copy.copy(self.defline) # Putting here in case abiTitle is set; Use for multiline qual
+        self.deflineCheck = self.defline.clone() # Putting here in case abiTitle is set; Use for multiline qual
 
     ############################################################
     # Initialize fastq reader to reflect current understanding
@@ -2059,18 +2254,13 @@ class FastqReader:
         
         self.length = self.readSeq()
 
-        # Process qual defline
+        # Process qual defline and read qual (possibly from separate file)
 
         if self.qualHandle:
             self.processQualDefline(self.qualHandle)
-        else:
-            self.processQualDefline(self.handle)
-
-        # Read qual
-
-        if self.qualHandle:
             self.lengthQual = self.readQual( self.qualHandle, self.deflineQual )
         else:
+            self.processQualDefline(self.handle)
             self.lengthQual = self.readQual( self.handle, self.defline )
 
         # Adjust for color space
@@ -2118,12 +2308,13 @@ class FastqReader:
         else:
             self.seqOrig = self.handle.readline()
             
-        self.seq = self.seqOrig.strip().upper()
+        seqStripped = self.seqOrig.strip()
+        self.seq = seqStripped.upper()
         
         if self.savedDeflineString or self.checkSeqQual or self.setClips:
             while True:
                 self.savedDeflineString = ''
-                seqIsValid = self.seqParser.parseSeq( self.seqOrig.strip() )
+                seqIsValid = self.seqParser.parseSeq( seqStripped, self.seq )
                 
                 if not self.seq:
                     break
@@ -2138,11 +2329,11 @@ class FastqReader:
                     attemptCount += 1
                     if attemptCount > 1000:
                         self.statusWriter.outputErrorAndExit("Failed to find valid seq after 1000 attempts near spot {} in file {} ... {}"
-                                                        .format(self.spotCount,self.filename,self.seqOrig.strip() ))
+                                                        .format(self.spotCount,self.filename,seqStripped ))
 
                     if self.outputStatus:
                         self.statusWriter.outputWarning("Discarding this line in readSeq while looking for a valid complete spot near spot {} in file {} ... {}"
-                                                        .format(self.spotCount,self.filename,self.seqOrig.strip() ))
+                                                        .format(self.spotCount,self.filename,seqStripped ))
                     self.findValidDefline(True)
                     
                     if self.isMultiLine:
@@ -2154,7 +2345,8 @@ class FastqReader:
                     else:
                         self.seqOrig = self.handle.readline()
                         
-                    self.seq = self.seqOrig.strip().upper()
+                    seqStripped = self.seqOrig.strip()
+                    self.seq = seqStripped.upper()
 
         return len ( self.seq )
 
@@ -2188,7 +2380,7 @@ class FastqReader:
 
         if self.checkSeqQual:
             while True:
-                qualIsValid = self.qualParser.parseQual(self.qualOrig.strip(), self.length) # remove leading/trailing spaces here
+                qualIsValid = self.qualParser.parseQual(self.qual.lstrip(), self.length) # remove leading spaces here too
                 if ( not self.qual or
                      qualIsValid ):
                     if self.qualParser.isNumQual:
@@ -2219,8 +2411,8 @@ class FastqReader:
             lengthQual = len ( self.qual )
 
         if ( lengthQual != self.length and
-             self.qual[0:1] == '"' and
-             not self.qual[1:2] == '"' and
+             self.qual.startswith('"') and
+             not self.qual.startswith('""') and
              self.qual[lengthQual-1] == '"' ):
             self.qual = self.qual[1:lengthQual-1]
             lengthQual -= 2
@@ -2233,7 +2425,7 @@ class FastqReader:
     
     def readMultiLineSeq (self):
         self.seqLineCount = 0
-        self.seqOrig = ''
+        seqChunks = [] # joined into seqOrig on return
         
         while True:
             fileStringOrig = self.handle.readline()
@@ -2242,6 +2434,7 @@ class FastqReader:
             # At EOF/20000 lines and did not find next defline
 
             if not fileStringOrig:
+                self.seqOrig = "".join( seqChunks )
                 return ''
 
             elif self.seqLineCount > 20000:
@@ -2251,15 +2444,16 @@ class FastqReader:
             # Check for defline. Note that deflineCharQual and deflineCharSeq are the same for seqQual fastq.
 
             elif ( ( self.isFasta and
-                     fileString[0:1] == self.deflineCharSeq ) or
-                   fileString[0:1] == self.deflineCharQual ):
+                     fileString.startswith(self.deflineCharSeq) ) or
+                   fileString.startswith(self.deflineCharQual) ):
+                self.seqOrig = "".join( seqChunks )
                 return fileString
 
             # Collect seq
             
             else:
                 self.seqLineCount += 1
-                self.seqOrig += fileString
+                seqChunks.append( fileString )
 
     ############################################################
     # Read multi-line qual (handle can be same or separate file)
@@ -2267,7 +2461,7 @@ class FastqReader:
     
     def readMultiLineQual ( self, handle, defline ):
         self.qualLineCount = 0
-        self.qualOrig = ''
+        qualChunks = [] # joined into qualOrig on return
         
         while True:
             fileStringOrig = handle.readline()
@@ -2276,6 +2470,7 @@ class FastqReader:
             # At EOF/20000 lines and did not find next read defline
 
             if not fileStringOrig:
+                self.qualOrig = "".join( qualChunks )
                 return ''
 
             elif self.qualLineCount > 1000:
@@ -2288,27 +2483,28 @@ class FastqReader:
             elif ( ( self.deflineCharSeq == '@' and
                      not defline.saveDeflineType ) or
                    ( defline.deflineType != defline.UNDEFINED and
-                     fileString[0:1] == self.deflineCharSeq and
+                     fileString.startswith(self.deflineCharSeq) and
                      self.deflineCheck.parseDeflineString(fileString) ) or
                    ( defline.deflineType == defline.UNDEFINED and
                      ( fileString[0:2] == self.deflineStringSeq[0:2] or
                        ( fileString[1:].isdigit() and
                          self.deflineStringSeq[1:].isdigit() ) ) and
                      self.deflineCheck.parseDeflineString(fileString) ) ):
+                self.qualOrig = "".join( qualChunks )
                 return fileString
 
             # Account for wrapped numerical quality
 
             if ( ( self.isNumQual or
                    " " in fileString ) and
-                 fileString[0:1] != " " ):
-                self.qualOrig += " "
+                 not fileString.startswith(" ") ):
+                qualChunks.append( " " )
                 self.isNumQual = True
 
             # Collect qual
             
             self.qualLineCount += 1
-            self.qualOrig += fileString
+            qualChunks.append( fileString )
 
     ############################################################
     # Find valid defline
@@ -2382,8 +2578,7 @@ class FastqReader:
             else:
                 self.qual = self.qual[1:]
             self.lengthQual -= 1
-        if ( space != -1 and
-             self.qual.find("-1") != -1 ):
+        if space != -1:
             self.qual = self.qual.replace("-1","0")
 
     ############################################################
@@ -2422,7 +2617,7 @@ class FastqReader:
         while True:
             prevPos = handle.tell()
             fileString = handle.readline()
-            if fileString[0:1] != "#":
+            if not fileString.startswith("#"):
                 handle.seek(prevPos)
                 break
             else:
@@ -2431,11 +2626,11 @@ class FastqReader:
                 # Check for abi title
                 
                 if ( not defline.abiTitle and
-                     re.match("# Title: ([!-~]+)",fileString) ):
-                    m = re.match("# Title: ([!-~]+)",fileString)
+                     fileString.startswith("# Title: ") and
+                     ( m := FastqReader.abiTitleRE.match(fileString) ) ):
                     defline.abiTitle = m.group(1)
-                    if re.search ( "_$", defline.abiTitle ):
-                        defline.abiTitle = defline.abiTitle[0:len(defline.abiTitle)-1]
+                    if defline.abiTitle.endswith("_"):
+                        defline.abiTitle = defline.abiTitle[:-1]
 					
         return headerLineCount
 
@@ -2590,6 +2785,7 @@ class FastaFastqReader (FastqReader):
         FastqReader.__init__(self, filename, handle)
         self.deflineCharSeq = ">"
         self.isFasta = True
+        self.defaultQualString = '' # reused while sequence length stays the same
 
     ############################################################
     # Read from fasta handle, fabricate quality
@@ -2640,7 +2836,9 @@ class FastaFastqReader (FastqReader):
             self.qual = ''
             self.eof = True
         else:
-            self.qualOrig = self.defaultQual * self.length
+            if len(self.defaultQualString) != self.length:
+                self.defaultQualString = self.defaultQual * self.length
+            self.qualOrig = self.defaultQualString
             self.qual = self.qualOrig
             self.lengthQual = self.length
             self.spotCount += 1
@@ -2653,10 +2851,12 @@ class FastaFastqReader (FastqReader):
         self.seqLineCount = 0
         maxSeqLineCount = 0
         
+        # A single multi-line record is enough, so stop at the first one
+
         self.restart()
         while ( self.spotCount < 1001 and
-                not ( self.seqOrig == "" or
-                      self.seqLineCount > 20000 ) ):
+                maxSeqLineCount < 2 and
+                self.seqOrig != "" ):
             self.read()
             if self.seqLineCount > maxSeqLineCount:
                 maxSeqLineCount = self.seqLineCount
@@ -2708,7 +2908,7 @@ class SingleLineFastqReader (FastqReader):
         # Split file line into chunks
             
         else:
-            self.deflineChunks = self.fileString.split(self.delim)
+            self.deflineChunks = self.fileString.rsplit(self.delim, 2) # defline, seq, qual
 
             # Process qual chunk
             
@@ -2770,7 +2970,7 @@ class SingleLineFastqReader (FastqReader):
                                                 .format(self.spotCount,self.filename,self.fileString) )
             fileStringOrig = self.handle.readline()
             self.fileString = fileStringOrig.strip()
-            self.deflineChunks = self.fileString.split( self.delim )
+            self.deflineChunks = self.fileString.rsplit( self.delim, 2 )
             self.lengthQual = self.readQual( self.handle, None )
             self.length = self.readSeq()
             self.deflineStringSeq = self.delim.join( self.deflineChunks )
@@ -2800,6 +3000,25 @@ class SingleLineFastqReader (FastqReader):
         else:
             return False
 
+############################################################
+# Read values retained while waiting for the mate of the read
+# (orphan/mixed reads). Many can be held at once, so using
+# slots rather than a dict per read.
+############################################################
+
+class SavedRead:
+    """ Read values retained until the read is written """
+
+    __slots__ = ( 'seq', 'qual', 'filterRead', 'csKey', 'qiimeName', 'suffix' )
+
+    def __init__(self, fastq):
+        self.seq = fastq.seq
+        self.qual = fastq.qual
+        self.filterRead = fastq.defline.filterRead
+        self.csKey = fastq.csKey
+        self.qiimeName = fastq.defline.qiimeName # can vary between read1 and read2
+        self.suffix = fastq.defline.suffix
+
 ############################################################
 # Class for writing fastq-based spots to SRA archive
 ############################################################
@@ -2811,6 +3030,28 @@ class FastqSpotWriter():
     READ_TYPE_BIOLOGICAL                = 1
     READ_TYPE_GROUP                     = 2
 
+    # Numerical quality token to value lookups (with and without
+    # '-1' mapped to 0). Anything else falls back to int().
+
+    NUM_QUAL_VALUES                     = { str(val) : val for val in range(-128,256) }
+    NUM_QUAL_VALUES_NEG_ONE_AS_ZERO     = dict( NUM_QUAL_VALUES, **{ '-1' : 0 } )
+
+    # Translation tables for ascii quality when '-1' is mapped to 0
+    # and for validating read type strings
+
+    TRANS_NEG_ONE                       = str.maketrans('?', '@')
+    TRANS_READ_TYPES                    = str.maketrans('', '', "BTG")
+
+    # Read type and filter arrays for the common spot layouts. These are
+    # shared across spots since gw copies column data as each row is written
+
+    READ_TYPES_T                        = array.array('B', [ 0 ])
+    READ_TYPES_B                        = array.array('B', [ 1 ])
+    READ_TYPES_TB                       = array.array('B', [ 0, 1 ])
+    READ_TYPES_BT                       = array.array('B', [ 1, 0 ])
+    READ_TYPES_BB                       = array.array('B', [ 1, 1 ])
+    READ_FILTERS_SINGLE                 = ( array.array('B', [ 0 ]), array.array('B', [ 1 ]) )
+
     def __init__(self):
 
         self.readCount = 0
@@ -2845,6 +3086,10 @@ class FastqSpotWriter():
         self.read2QualFiles = None
         self.spotGroup = ''
         self.spotGroupsFound = {}
+        self.spotGroupData = {}
+        self.readLengthsLast = None
+        self.readStartArrayLast = None
+        self.readLengthArrayLast = None
         self.discardBarcodes = False
         self.ignoreNames = False
         self.discardNames = False
@@ -2859,6 +3104,8 @@ class FastqSpotWriter():
 
         self.lengthsProvided = False
         self.variableLengthSpecified = False
+        self.variableReadLengths = None
+        self.fixedReadLength = 0
         self.labelsProvided = False
         self.spotGroupProvided = False
         self.offsetProvided = False
@@ -2877,10 +3124,6 @@ class FastqSpotWriter():
         
         self.logOdds = False            # Indicated by presence of negative qualities
         self.changeNegOneQual = False   # '-1' only is likely used for dot or N qualities
-        if (sys.version).startswith("3"):
-            self.transNegOne = str.maketrans('?', '@')
-        else:
-            self.transNegOne = string.maketrans('?', '@')
         self.readNums = []
 
         self.gw = None
@@ -3132,17 +3375,17 @@ class FastqSpotWriter():
         
         elif fastq2 :
             if self.readTypes[0] == self.READ_TYPE_TECHNICAL:
-                self.dst['READ_TYPE']['data'] = array.array( 'B', [ 0, 1 ] )
+                self.dst['READ_TYPE']['data'] = self.READ_TYPES_TB
             elif self.readTypes[1] == self.READ_TYPE_TECHNICAL:
-                self.dst['READ_TYPE']['data'] = array.array( 'B', [ 1, 0 ] )
+                self.dst['READ_TYPE']['data'] = self.READ_TYPES_BT
             else:
-                self.dst['READ_TYPE']['data'] = array.array( 'B', [ 1, 1 ] )
+                self.dst['READ_TYPE']['data'] = self.READ_TYPES_BB
 
         # Fragment file
         
         elif not self.lengthsProvided :
             self.dst['READ_START']['data'] = array.array( 'I', [ 0 ] )
-            self.dst['READ_TYPE']['data'] = array.array( 'B', [ 1 ] )
+            self.dst['READ_TYPE']['data'] = self.READ_TYPES_B
 
         # Lengths provided
         
@@ -3253,9 +3496,9 @@ class FastqSpotWriter():
 
             if fastq2 :
                 if not fastq1.seq:
-                    self.dst['READ_TYPE']['data'] = array.array( 'B', [ 0, 1 ] )
+                    self.dst['READ_TYPE']['data'] = self.READ_TYPES_TB
                 elif not fastq2.seq:
-                    self.dst['READ_TYPE']['data'] = array.array( 'B', [ 1, 0 ] )
+                    self.dst['READ_TYPE']['data'] = self.READ_TYPES_BT
 
             # Finally write to general writer
 
@@ -3266,7 +3509,7 @@ class FastqSpotWriter():
             if ( fastq2 and
                  ( not fastq1.seq or
                    not fastq2.seq ) ):
-                self.dst['READ_TYPE']['data'] = array.array( 'B', [ 1, 1 ] )
+                self.dst['READ_TYPE']['data'] = self.READ_TYPES_BB
 
     ############################################################
     # Process spot from pair of fastq files
@@ -3276,14 +3519,14 @@ class FastqSpotWriter():
         self.dst[self.readColumn]['data'] = (fastq1.seq + fastq2.seq).encode('ascii')
         if self.isColorSpace:
             self.dst['CS_KEY']['data'] = (fastq1.csKey + fastq2.csKey).encode('ascii')
-        self.dst['READ_START']['data'] = array.array( 'I', [ 0, len(fastq1.seq) ] )
-        self.dst['READ_LENGTH']['data'] = array.array( 'I', [ len(fastq1.seq), len(fastq2.seq) ] )
+        self.setDstReadLengths ( ( len(fastq1.seq), len(fastq2.seq) ) )
         
         if ( fastq1.defline.filterRead or
              fastq2.defline.filterRead ):
-            self.dst['READ_FILTER']['data'] = array.array('B', [ 1, 1 ] )
+            self.readFilters[0] = self.readFilters[1] = 1
         else:
-            self.dst['READ_FILTER']['data'] = array.array('B', [ 0, 0 ] )
+            self.readFilters[0] = self.readFilters[1] = 0
+        self.dst['READ_FILTER']['data'] = self.readFilters
 
         # Put space in so subsequent split on white space works and two qual
         # values are not side-by-side
@@ -3294,6 +3537,25 @@ class FastqSpotWriter():
             fastq1.qual += " "
         self.setDstQual ( fastq1.qual + fastq2.qual, self.dst )
 
+    ############################################################
+    # Set read starts/lengths for spot made of consecutive reads.
+    # Read lengths rarely change within a run, so the arrays from
+    # the previous spot are reused while the lengths are the same
+    ############################################################
+    
+    def setDstReadLengths ( self, readLengths ):
+        if readLengths != self.readLengthsLast:
+            self.readLengthsLast = readLengths
+            readStarts = []
+            readStart = 0
+            for readLength in readLengths:
+                readStarts.append(readStart)
+                readStart += readLength
+            self.readStartArrayLast = array.array( 'I', readStarts )
+            self.readLengthArrayLast = array.array( 'I', readLengths )
+        self.dst['READ_START']['data'] = self.readStartArrayLast
+        self.dst['READ_LENGTH']['data'] = self.readLengthArrayLast
+
     ############################################################
     # Process fragment from single fastq file
     ############################################################
@@ -3302,8 +3564,8 @@ class FastqSpotWriter():
         self.dst[self.readColumn]['data'] = fastq1.seq.encode('ascii')
         if self.isColorSpace:
             self.dst['CS_KEY']['data'] = fastq1.csKey.encode('ascii')
-        self.dst['READ_LENGTH']['data'] = array.array( 'I', [ len(fastq1.seq) ] )
-        self.dst['READ_FILTER']['data'] = array.array('B', [ fastq1.defline.filterRead ] )
+        self.setDstReadLengths ( ( len(fastq1.seq), ) )
+        self.dst['READ_FILTER']['data'] = self.READ_FILTERS_SINGLE[fastq1.defline.filterRead]
         self.setDstQual ( fastq1.qual, self.dst )
 
     ############################################################
@@ -3319,18 +3581,8 @@ class FastqSpotWriter():
             if self.setClips:
                 clipQualityRight = len(fastq1.seq) - fastq1.clipRight
             if self.variableLengthSpecified :
-                readLengthsLocal = array.array('I', [0] * self.readCount)
-                readLengthsLocal[0] = self.readLengths[0]
-                if self.readCount == 2:
-                    readLengthsLocal[1] = len(fastq1.seq) - self.readLengths[0]
-                elif self.readCount == 3:
-                    readLengthsLocal[1] = self.readLengths[1]
-                    readLengthsLocal[2] = len(fastq1.seq) - self.readLengths[0] - self.readLengths[1]
-                elif self.readCount == 4:
-                    readLengthsLocal[1] = self.readLengths[1]
-                    readLengthsLocal[2] = self.readLengths[2]
-                    readLengthsLocal[3] = len(fastq1.seq) - self.readLengths[0] - self.readLengths[1] - self.readLengths[2]
-                self.dst['READ_LENGTH']['data'] = readLengthsLocal
+                self.variableReadLengths[-1] = len(fastq1.seq) - self.fixedReadLength
+                self.dst['READ_LENGTH']['data'] = self.variableReadLengths
         else:
             seq = ""
             qual = ""
@@ -3493,12 +3745,12 @@ class FastqSpotWriter():
     def write2Dread (self, fastq, read2D):
         
         self.setNanoporeColumns ( fastq, self.dst2D )
-        self.dst2D['READ_FILTER']['data'] = array.array('B', [ fastq.defline.filterRead ] )
-        self.dst2D['READ_TYPE']['data'] = array.array( 'B', [ 1 ] )
+        self.dst2D['READ_FILTER']['data'] = self.READ_FILTERS_SINGLE[fastq.defline.filterRead]
+        self.dst2D['READ_TYPE']['data'] = self.READ_TYPES_B
         if read2D:
-            self.dst2D['READ']['data'] = read2D['seq'].encode('ascii')
-            self.dst2D['READ_LENGTH']['data'] = array.array( 'I', [ len(read2D['seq']) ] )
-            self.setDstQual ( read2D['qual'], self.dst2D )
+            self.dst2D['READ']['data'] = read2D.seq.encode('ascii')
+            self.dst2D['READ_LENGTH']['data'] = array.array( 'I', [ len(read2D.seq) ] )
+            self.setDstQual ( read2D.qual, self.dst2D )
         else:
             self.dst2D['READ']['data'] = fastq.seq.encode('ascii')
             self.dst2D['READ_LENGTH']['data'] = array.array( 'I', [ len(fastq.seq) ] )
@@ -3520,8 +3772,8 @@ class FastqSpotWriter():
         
         self.setNanoporeColumns ( fastq, self.dst )
         self.dst['READ_LENGTH']['data'] = array.array( 'I', [0] )
-        self.dst['READ_FILTER']['data'] = array.array('B', [ fastq.defline.filterRead ] )
-        self.dst['READ_TYPE']['data'] = array.array( 'B', [ 0 ] )
+        self.dst['READ_FILTER']['data'] = self.READ_FILTERS_SINGLE[fastq.defline.filterRead]
+        self.dst['READ_TYPE']['data'] = self.READ_TYPES_T
         self.dst['READ']['data'] = ''.encode('ascii')
         self.setDstQual ( '', self.dst )
         self.setDstName ( fastq, self.dst )
@@ -3537,8 +3789,8 @@ class FastqSpotWriter():
         
         self.setNanoporeColumns ( fastq, self.dst2D )
         self.dst2D['READ_LENGTH']['data'] = array.array( 'I', [0] )
-        self.dst2D['READ_FILTER']['data'] = array.array('B', [ fastq.defline.filterRead ] )
-        self.dst2D['READ_TYPE']['data'] = array.array( 'B', [ 0 ] )
+        self.dst2D['READ_FILTER']['data'] = self.READ_FILTERS_SINGLE[fastq.defline.filterRead]
+        self.dst2D['READ_TYPE']['data'] = self.READ_TYPES_T
         self.dst2D['READ']['data'] = ''.encode('ascii')
         self.setDstQual ( '', self.dst2D )
         self.setDstName ( fastq, self.dst2D )
@@ -3591,7 +3843,7 @@ class FastqSpotWriter():
             fastq1 = fastq2
             fastq2 = save
         self.processPairFastqSpot ( fastq1, fastq2 )
-        self.dst['READ_TYPE']['data'] = array.array( 'B', [ 1, 1 ] )
+        self.dst['READ_TYPE']['data'] = self.READ_TYPES_BB
         self.setDstName ( fastq1, self.dst )
         self.setDstSpotGroup ( fastq1, None, self.dst )
         self.gw.write(self.dst)
@@ -3603,24 +3855,24 @@ class FastqSpotWriter():
     def writeMixedRead1 ( self, fastq1 ):
         read2 = self.pairedRead2 [ fastq1.defline.name ]
         del self.pairedRead2 [ fastq1.defline.name ]
-        self.dst[self.readColumn]['data'] = (fastq1.seq + read2['seq']).encode('ascii')
+        self.dst[self.readColumn]['data'] = (fastq1.seq + read2.seq).encode('ascii')
         if self.isColorSpace:
-            self.dst['CS_KEY']['data'] = (fastq1.csKey + read2['csKey']).encode('ascii')
-        self.dst['READ_START']['data'] = array.array( 'I', [ 0, len(fastq1.seq) ] )
-        self.dst['READ_LENGTH']['data'] = array.array( 'I', [ len(fastq1.seq), len(read2['seq']) ] )
+            self.dst['CS_KEY']['data'] = (fastq1.csKey + read2.csKey).encode('ascii')
+        self.setDstReadLengths ( ( len(fastq1.seq), len(read2.seq) ) )
         if ( fastq1.defline.filterRead or
-             read2['filterRead'] ):
-            self.dst['READ_FILTER']['data'] = array.array('B', [ 1, 1 ] )
+             read2.filterRead ):
+            self.readFilters[0] = self.readFilters[1] = 1
         else:
-            self.dst['READ_FILTER']['data'] = array.array('B', [ 0, 0 ] )
+            self.readFilters[0] = self.readFilters[1] = 0
+        self.dst['READ_FILTER']['data'] = self.readFilters
 
         if ( self.isNumQual and
              fastq1.qual and
-             read2['qual'] ):
+             read2.qual ):
             fastq1.qual += " "
-        self.setDstQual ( fastq1.qual + read2['qual'], self.dst )
+        self.setDstQual ( fastq1.qual + read2.qual, self.dst )
         
-        self.dst['READ_TYPE']['data'] = array.array( 'B', [ 1, 1 ] )
+        self.dst['READ_TYPE']['data'] = self.READ_TYPES_BB
         self.setDstName ( fastq1, self.dst )
         self.setDstSpotGroup ( fastq1, None, self.dst )
         self.gw.write(self.dst)
@@ -3632,33 +3884,33 @@ class FastqSpotWriter():
     def writeMixedRead2 ( self, fastq2 ):
         read1 = self.pairedRead1 [ fastq2.defline.name ]
         del self.pairedRead1 [ fastq2.defline.name ]
-        self.dst[self.readColumn]['data'] = (read1['seq'] + fastq2.seq ).encode('ascii')
+        self.dst[self.readColumn]['data'] = (read1.seq + fastq2.seq ).encode('ascii')
         if self.isColorSpace:
-            self.dst['CS_KEY']['data'] = ( read1['csKey'] + fastq2.csKey ).encode('ascii')
-        self.dst['READ_START']['data'] = array.array( 'I', [ 0, len(read1['seq']) ] )
-        self.dst['READ_LENGTH']['data'] = array.array( 'I', [ len(read1['seq']), len(fastq2.seq) ] )
-        if ( read1['filterRead'] or
+            self.dst['CS_KEY']['data'] = ( read1.csKey + fastq2.csKey ).encode('ascii')
+        self.setDstReadLengths ( ( len(read1.seq), len(fastq2.seq) ) )
+        if ( read1.filterRead or
              fastq2.defline.filterRead ):
-            self.dst['READ_FILTER']['data'] = array.array('B', [ 1, 1 ] )
+            self.readFilters[0] = self.readFilters[1] = 1
         else:
-            self.dst['READ_FILTER']['data'] = array.array('B', [ 0, 0 ] )
+            self.readFilters[0] = self.readFilters[1] = 0
+        self.dst['READ_FILTER']['data'] = self.readFilters
 
         if ( self.isNumQual and
-             read1['qual'] and
+             read1.qual and
              fastq2.qual ):
-             read1['qual'] += " "
+             read1.qual += " "
             
-        self.setDstQual ( read1['qual'] + fastq2.qual, self.dst )
+        self.setDstQual ( read1.qual + fastq2.qual, self.dst )
         
-        self.dst['READ_TYPE']['data'] = array.array( 'B', [ 1, 1 ] )
+        self.dst['READ_TYPE']['data'] = self.READ_TYPES_BB
 
         # qiime name can vary between read1 and read2 (read1 name is used)
         
         if fastq2.defline.qiimeName:
-            fastq2.defline.qiimeName = read1['qiimeName']
+            fastq2.defline.qiimeName = read1.qiimeName
 
         if fastq2.defline.suffix:
-            fastq2.defline.suffix = read1['suffix']
+            fastq2.defline.suffix = read1.suffix
 
         self.setDstName ( fastq2, self.dst )
         self.setDstSpotGroup ( fastq2, None, self.dst )
@@ -3671,7 +3923,7 @@ class FastqSpotWriter():
     def writeMixedOrphan ( self, fastq ):
         self.processFragmentFastqSpot ( fastq )
         self.dst['READ_START']['data'] = array.array( 'I', [ 0 ] )
-        self.dst['READ_TYPE']['data'] = array.array( 'B', [ 1 ] )
+        self.dst['READ_TYPE']['data'] = self.READ_TYPES_B
         self.setDstName ( fastq, self.dst )
         self.setDstSpotGroup ( fastq, None, self.dst )
         self.gw.write(self.dst)
@@ -3681,18 +3933,7 @@ class FastqSpotWriter():
     ############################################################
     
     def addToPairedReadHash ( self, fastq ):
-        if self.isColorSpace:
-            readValues = { 'seq':fastq.seq, 'qual':fastq.qual, 'filterRead':fastq.defline.filterRead, 'csKey':fastq.csKey }
-        else:
-            readValues = { 'seq':fastq.seq, 'qual':fastq.qual, 'filterRead':fastq.defline.filterRead }
-
-        # qiime name can vary between read1 and read2
-        
-        if fastq.defline.qiimeName:
-            readValues['qiimeName'] = fastq.defline.qiimeName
-            
-        if fastq.defline.suffix:
-            readValues['suffix'] = fastq.defline.suffix
+        readValues = SavedRead ( fastq )
 
         if ( ( fastq.defline.readNum and
                fastq.defline.readNum == "1") or
@@ -3714,8 +3955,7 @@ class FastqSpotWriter():
             if fastq.defline.poreRead != "2D":
                 self.addToPairedReadHash ( fastq )
             elif not fastq.defline.name in self.nanopore2Dread :
-                readValues = { 'seq':fastq.seq, 'qual':fastq.qual, 'filterRead':fastq.defline.filterRead }
-                self.nanopore2Dread[fastq.defline.name] = readValues
+                self.nanopore2Dread[fastq.defline.name] = SavedRead ( fastq )
 
     ############################################################
     # Dump leftover orphan reads
@@ -3784,13 +4024,19 @@ class FastqSpotWriter():
                    not self.discardNames ):
                 spotGroup = fastq.defline.spotGroup
 
-        dst['SPOT_GROUP']['data'] = spotGroup.encode('ascii')
-        if ( spotGroup and
-             not self.spotGroupProvided and
-             not spotGroup in self.spotGroupsFound ):
-            self.spotGroupsFound[spotGroup] = 1
-            if len ( self.spotGroupsFound ) > 30000:
-                self.statusWriter.outputErrorAndExit( "Over 30000 unique spot groups were found within this submission. Please specify '--discardBarcodes'" )
+        # Same few spot groups repeat across the whole run, so keep
+        # one encoded copy of each rather than encoding every spot
+
+        spotGroupData = self.spotGroupData.get(spotGroup)
+        if spotGroupData is None:
+            spotGroupData = spotGroup.encode('ascii')
+            self.spotGroupData[spotGroup] = spotGroupData
+            if ( spotGroup and
+                 not self.spotGroupProvided ):
+                self.spotGroupsFound[spotGroup] = 1
+                if len ( self.spotGroupsFound ) > 30000:
+                    self.statusWriter.outputErrorAndExit( "Over 30000 unique spot groups were found within this submission. Please specify '--discardBarcodes'" )
+        dst['SPOT_GROUP']['data'] = spotGroupData
 
     ############################################################
     # Set quality in destination array
@@ -3802,7 +4048,7 @@ class FastqSpotWriter():
             dst['QUALITY']['data'] = qualVals
         else:
             if self.changeNegOneQual:
-                qualString = qualString.translate(self.transNegOne)
+                qualString = qualString.translate(self.TRANS_NEG_ONE)
             dst['QUALITY']['data'] = qualString.encode('ascii')
 
     ############################################################
@@ -3812,12 +4058,27 @@ class FastqSpotWriter():
     def getNumQualArray ( self, qualString ):
 
         qualValStrings = qualString.split()
-        qualIndex = -1
-        
+
         if self.logOdds:
-            qualVals = array.array('b', [0] * len(qualValStrings) )
+            typeCode = 'b'
+        else:
+            typeCode = 'B'
+
+        # Convert all values in one go via table lookup. Values not in
+        # the table (e.g. leading '+' or zeros) go through int() below.
+
+        if self.changeNegOneQual:
+            numQualValues = self.NUM_QUAL_VALUES_NEG_ONE_AS_ZERO
         else:
-            qualVals = array.array('B', [0] * len(qualValStrings) )
+            numQualValues = self.NUM_QUAL_VALUES
+
+        try:
+            return array.array( typeCode, map( numQualValues.__getitem__, qualValStrings ) )
+        except KeyError:
+            pass
+
+        qualVals = array.array( typeCode, [0] * len(qualValStrings) )
+        qualIndex = -1
 
         for qualValString in qualValStrings:
             qualIndex += 1
@@ -3909,17 +4170,19 @@ class FastqSpotWriter():
                 self.statusWriter.outputErrorAndExit( "Non-integer length specified ... {}".format(readLen))
         self.lengthsProvided = True
 
+        # Only the last read length varies per spot when variable length
+        # is specified, so keep a copy to patch and the fixed length before it
+
+        self.variableReadLengths = array.array('I', self.readLengths)
+        self.fixedReadLength = sum( self.readLengths[:-1] )
+
     ############################################################
     # Set read types from provided read type string
     ############################################################
     
     def setReadTypes (self,readTypeString):
         readTypeString = readTypeString.strip()
-        if (sys.version).startswith("3"):
-            transType = str.maketrans('', '', "BTG")
-            empty = readTypeString.translate(transType)
-        else:
-            empty = readTypeString.translate(None, "BTG")
+        empty = readTypeString.translate(self.TRANS_READ_TYPES)
         if len(empty) != 0:
             self.statusWriter.outputErrorAndExit( "Invalid read type specified (only B, T, or G allowed) ... {}".format(readTypeString) )
 
@@ -5297,7 +5560,62 @@ def processFiles (determineOffsetAndClip):
             statusWriter.outputInfo( "Quality values are in an ascii form with an offset of 33" )
 
     else:
-        sw.gw = None # close stream and flush
+        if sw.gw:
+            sw.gw.close() # flush buffered rows and end stream
+        sw.gw = None
+
+############################################################
+# Open fastq file. The underlying stream is always binary
+# (plain, gzip or bz2) and decoding happens in one place, the
+# latin-1 text layer on top, which maps bytes to characters
+# one-to-one without validation and so never fails on input
+############################################################
+
+def openFastqFile ( filename, path ):
+    if filename.endswith(".gz"):
+        decompressor = gzip.open
+    elif filename.endswith(".bz2"):
+        decompressor = bz2.BZ2File
+    else:
+        return io.TextIOWrapper ( openSequentialFile ( path ), encoding='latin-1' )
+
+    # Decompress in a separate thread (zlib/bz2 release the GIL) so
+    # that it overlaps with parsing. Only pays off with a spare cpu.
+
+    if hasattr(os, 'sched_getaffinity'):
+        cpuCount = len( os.sched_getaffinity(0) )
+    else:
+        cpuCount = os.cpu_count() or 1
+
+    # gzip/bz2 do not close a file object they are given, so the
+    # DecompressReader owns the raw handle. Without the thread the
+    # decompressor opens (and closes) the file from the path.
+
+    if cpuCount > 1:
+        rawHandle = openSequentialFile ( path )
+        def openDecompressor():
+            rawHandle.seek(0)
+            return decompressor ( rawHandle, 'rb' )
+        handle = io.BufferedReader ( DecompressReader(openDecompressor, rawHandle), 1048576 )
+    else:
+        handle = decompressor ( path, 'rb' )
+    return io.TextIOWrapper ( handle, encoding='latin-1' )
+
+############################################################
+# Open file for binary reading. Files are read front to back
+# (apart from restarts after characterization), so ask the
+# kernel for aggressive readahead. Not available/applicable
+# everywhere (e.g. pipes), so best effort.
+############################################################
+
+def openSequentialFile ( path ):
+    rawHandle = open ( path, 'rb', buffering=1048576 )
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise ( rawHandle.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL )
+        except OSError:
+            pass
+    return rawHandle
 
 ############################################################
 # Generate archive from provided fastq files
@@ -5308,12 +5626,7 @@ def generateArchive():
     # Open files to be processed
 
     for filename in filePaths:
-        if filename.endswith(".gz"):
-            fileHandles[filename] = gzip.open ( filePaths[filename], 'rt' )
-        elif filename.endswith(".bz2"):
-            fileHandles[filename] = bz2.BZ2File( filePaths[filename] )
-        else:
-            fileHandles[filename] = open ( filePaths[filename] )
+        fileHandles[filename] = openFastqFile ( filename, filePaths[filename] )
 
     # Process file lists if provided
 
@@ -8,3 +8,12 @@ python3 fastq-load.py --output=foo ${R1} >/dev/null
 
 # two file test
 python3 fastq-load.py --output=foo --read1PairFiles=${R1} --read2PairFiles=${R2} ${R1} ${R2} >/dev/null
+
+# decompression reader tests
+python3 test_decompress_reader.py
+
+# general writer row buffering tests
+python3 ../../shared/python/test_general_writer.py
+
+# variable last read length tests
+python3 test_read_lengths.py
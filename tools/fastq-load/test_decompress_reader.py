@@ -0,0 +1,87 @@
+# Tests for fastq-load.py's DecompressReader
+#
+# fastq-load.py runs a load when imported, so only the DecompressReader
+# class is pulled out of its source and executed here.
+
+import ast
+import gzip
+import io
+import os
+import queue
+import tempfile
+import threading
+import unittest
+
+def loadDecompressReader():
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fastq-load.py")
+    with open(path) as source:
+        tree = ast.parse(source.read(), path)
+    classDef = [ node for node in tree.body
+                 if isinstance(node, ast.ClassDef) and node.name == "DecompressReader" ][0]
+    namespace = { 'io' : io, 'queue' : queue, 'threading' : threading }
+    exec(compile(ast.Module([classDef], []), path, 'exec'), namespace)
+    return namespace['DecompressReader']
+
+DecompressReader = loadDecompressReader()
+
+class DecompressReaderTest (unittest.TestCase):
+
+    def setUp(self):
+        # A little over three chunks of decompressed data
+
+        self.data = bytes( i % 251 for i in range( DecompressReader.chunkSize * 3 + 12345 ) )
+        handle, self.path = tempfile.mkstemp(suffix=".gz")
+        with os.fdopen(handle, 'wb') as compressed:
+            compressed.write(gzip.compress(self.data, 1))
+        self.rawHandle = open(self.path, 'rb')
+
+        def openDecompressor():
+            self.rawHandle.seek(0)
+            return gzip.open(self.rawHandle, 'rb')
+
+        self.reader = DecompressReader(openDecompressor, self.rawHandle)
+
+    def tearDown(self):
+        self.reader.close()
+        os.unlink(self.path)
+
+    def testReadToEof(self):
+        handle = io.BufferedReader(self.reader, 1048576)
+        self.assertEqual(handle.read(), self.data)
+        self.assertEqual(handle.read(), b'')
+        self.assertEqual(self.reader.tell(), len(self.data))
+
+    def testSeekBackwardAfterSeveralChunks(self):
+        handle = io.BufferedReader(self.reader, 1048576)
+        handle.read( DecompressReader.chunkSize * 2 + 100 )
+        handle.seek(10)
+        self.assertEqual(handle.read(1000), self.data[10:1010])
+        handle.seek(DecompressReader.chunkSize + 5)
+        self.assertEqual(handle.read(), self.data[DecompressReader.chunkSize + 5:])
+
+    def testSeekForwardAndCurrent(self):
+        self.assertEqual(self.reader.seek(DecompressReader.chunkSize + 7), DecompressReader.chunkSize + 7)
+        self.assertEqual(self.reader.seek(3, io.SEEK_CUR), DecompressReader.chunkSize + 10)
+        self.assertEqual(self.reader.read(4), self.data[DecompressReader.chunkSize + 10:DecompressReader.chunkSize + 14])
+        self.assertRaises(io.UnsupportedOperation, self.reader.seek, 0, io.SEEK_END)
+
+    def testSeekPastEof(self):
+        self.assertEqual(self.reader.seek(len(self.data) + 100), len(self.data))
+        self.assertEqual(self.reader.read(10), b'')
+
+    def testCloseWhileProducerBlocked(self):
+        # Read nothing so the thread fills the queue and blocks on put()
+
+        thread = self.reader.thread
+        while not self.reader.chunks.full():
+            thread.join(0.01)
+        closer = threading.Thread(target=self.reader.close)
+        closer.start()
+        closer.join(10)
+        self.assertFalse(closer.is_alive())
+        self.assertFalse(thread.is_alive())
+        self.assertTrue(self.reader.closed)
+        self.assertTrue(self.rawHandle.closed)
+
+if __name__ == "__main__":
+    unittest.main()
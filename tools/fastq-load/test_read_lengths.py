@@ -0,0 +1,122 @@
+# Tests for READ_LENGTH with --readLens where the last read is variable (0)
+#
+# fastq-load.py is run on a small fastq file and the general-loader
+# stream it writes is decoded to get READ_LENGTH for each spot.
+
+import array
+import os
+import struct
+import subprocess
+import sys
+import tempfile
+import unittest
+
+TOOL_DIR = os.path.dirname(os.path.abspath(__file__))
+SHARED_DIR = os.path.join(TOOL_DIR, "..", "..", "shared", "python")
+sys.path.insert(0, SHARED_DIR)
+
+from GeneralWriter import GeneralWriter
+
+# fastq-load.py waits for general-loader after the load; end the run
+# at that first sleep instead
+
+BOOT = ( "import sys, time; time.sleep = lambda s: sys.exit(0); "
+         "sys.argv[0] = {0!r}; exec(compile(open({0!r}).read(), {0!r}, 'exec'))"
+         .format(os.path.join(TOOL_DIR, "fastq-load.py")) )
+
+SEQS = [ "ACGTACGTACGTACGTACGT", "ACGTACGTACGTACGTACGTACGTA", "ACGTACGTACGTACGTACGTACGTACGTACGT" ]
+
+############################################################
+# Decode general-loader stream into rows of column values
+############################################################
+
+def readStream(stream):
+    pos = struct.calcsize("8s 4I")
+    columns = {}
+    defaults = {}
+    row = {}
+    rows = []
+
+    def padded(length):
+        return length + ( -length % 4 )
+
+    while pos < len(stream):
+        (eid,) = struct.unpack_from("I", stream, pos)
+        evt = eid & 0xff000000
+        eventId = eid & 0x00ffffff
+        if evt in ( GeneralWriter.evt_end_stream, GeneralWriter.evt_open_stream ):
+            pos += 4
+        elif evt == GeneralWriter.evt_next_row:
+            pos += 4
+            rows.append( dict(defaults, **row) )
+            row = {}
+        elif evt in ( GeneralWriter.evt_errmsg, GeneralWriter.evt_remote_path,
+                      GeneralWriter.evt_new_table, GeneralWriter.evt_logmsg ):
+            (length,) = struct.unpack_from("I", stream, pos + 4)
+            pos += padded(8 + length)
+        elif evt in ( GeneralWriter.evt_use_schema, GeneralWriter.evt_software_name,
+                      GeneralWriter.evt_db_metadata_node, GeneralWriter.evt_tbl_metadata_node,
+                      GeneralWriter.evt_col_metadata_node ):
+            (length1, length2) = struct.unpack_from("2I", stream, pos + 4)
+            pos += padded(12 + length1 + length2)
+        elif evt == GeneralWriter.evt_new_column:
+            (tableId, bits, length) = struct.unpack_from("3I", stream, pos + 4)
+            name = stream[pos + 16 : pos + 16 + length].decode('ascii')
+            columns[eventId] = ( name, bits )
+            pos += padded(16 + length)
+        elif evt in ( GeneralWriter.evt_cell_default, GeneralWriter.evt_cell_data ):
+            (count,) = struct.unpack_from("I", stream, pos + 4)
+            name, bits = columns[eventId]
+            length = count * bits // 8
+            data = stream[pos + 8 : pos + 8 + length]
+            if bits == 32:
+                data = array.array('I', data).tolist()
+            if evt == GeneralWriter.evt_cell_default:
+                defaults[name] = data
+            else:
+                row[name] = data
+            pos += padded(8 + length)
+        else:
+            raise ValueError("unexpected event {:#x}".format(eid))
+    return rows
+
+class ReadLengthsTest (unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.fastq = os.path.join(self.dir.name, "reads.fastq")
+        with open(self.fastq, "w") as handle:
+            for index, seq in enumerate(SEQS):
+                handle.write("@read{}\n{}\n+\n{}\n".format(index, seq, "I" * len(seq)))
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def readLengths(self, readLens, readTypes):
+        env = dict(os.environ, PYTHONPATH=SHARED_DIR)
+        p = subprocess.run([sys.executable, '-c', BOOT,
+                            '--output=' + os.path.join(self.dir.name, "out"),
+                            '--readLens=' + readLens, '--readTypes=' + readTypes,
+                            '--offset=33', self.fastq],
+                           capture_output=True, env=env, timeout=120)
+        self.assertEqual(p.returncode, 0, p.stderr.decode())
+        return [ row['(INSDC:coord:len)READ_LEN'] for row in readStream(p.stdout) ]
+
+    def testSingleVariableRead(self):
+        self.assertEqual(self.readLengths("0", "B"),
+                         [ [ len(seq) ] for seq in SEQS ])
+
+    def testTwoReads(self):
+        self.assertEqual(self.readLengths("4,0", "TB"),
+                         [ [ 4, len(seq) - 4 ] for seq in SEQS ])
+
+    def testFiveReads(self):
+        self.assertEqual(self.readLengths("4,3,2,1,0", "BBBBB"),
+                         [ [ 4, 3, 2, 1, len(seq) - 10 ] for seq in SEQS ])
+
+    def testSixReads(self):
+        self.assertEqual(self.readLengths("2,2,2,2,2,0", "TBBBBB"),
+                         [ [ 2, 2, 2, 2, 2, len(seq) - 10 ] for seq in SEQS ])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -463,5 +463,6 @@ def cleanup():
 
 
 main()
-gw = None # close stream and flush
+gw.close() # flush buffered rows and end stream
+gw = None
 cleanup()